@@ -1,16 +1,41 @@
 import os
 import ast
 import json
+import hashlib
 import requests
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    def _dumps(data) -> bytes:
+        return json.dumps(data).encode('utf-8')
+
+    _loads = json.loads
+
 PROJECT_ROOT = Path(os.environ.get('PROJECT_ROOT', '/mnt/actual_code'))
 CODE_DIRS = [PROJECT_ROOT / 'backend', PROJECT_ROOT / 'app']
 DOCS_DIR = PROJECT_ROOT / 'docs'
 OUTPUT_FILE = DOCS_DIR / 'code_story.md'
+# Stories from earlier runs, keyed by relative path; see stale_digest() and GENERATOR_KEY
+CACHE_FILE = DOCS_DIR / '.code_story_cache.json'
 # OLLAMA_URL can be set via environment variable, defaults to Docker host-friendly URL
 OLLAMA_URL = os.environ.get('OLLAMA_URL', 'http://host.docker.internal:11434/api/generate')
 OLLAMA_MODEL = 'llama2'  # Change to your preferred local model
+# Concurrent story requests; Ollama queues anything beyond its own parallelism
+OLLAMA_WORKERS = int(os.environ.get('OLLAMA_WORKERS', '8'))
+
+# Shared by every call_ollama, so the worker threads reuse keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=OLLAMA_WORKERS, pool_maxsize=OLLAMA_WORKERS)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.headers['Content-Type'] = 'application/json'
 
 PROMPT_TEMPLATE = '''
 You are a creative technical storyteller. Here is a list of classes and functions from the file {filename}, with their docstrings:
@@ -18,24 +43,52 @@ You are a creative technical storyteller. Here is a list of classes and function
 Write a fun, engaging, and insightful story about how and why these components were created, as if you are narrating the evolution of this part of the codebase. Make it exciting and accessible to both developers and non-developers.
 '''
 
+# A story depends on the model and prompt as well as the file, so a cache written
+# with a different OLLAMA_MODEL or PROMPT_TEMPLATE is discarded as a whole
+GENERATOR_KEY = f"{OLLAMA_MODEL}:{hashlib.blake2b(PROMPT_TEMPLATE.encode('utf-8'), digest_size=16).hexdigest()}"
+
 def ensure_docs_dir():
     if not DOCS_DIR.exists():
         DOCS_DIR.mkdir()
         print(f"Created docs/ directory.")
 
+def load_story_cache():
+    try:
+        cache = _loads(CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('generator') != GENERATOR_KEY:
+        return {}
+    return cache.get('files', {})
+
+def save_story_cache(cache):
+    CACHE_FILE.write_bytes(_dumps({'generator': GENERATOR_KEY, 'files': cache}))
+
+def stale_digest(entry, py_file, st):
+    """Return the digest of py_file if its cached story is stale, or None if it can be reused."""
+    if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+        return None
+    # mtime/size changed; a touched but identical file still reuses its story
+    digest = hashlib.blake2b(py_file.read_bytes(), digest_size=16).hexdigest()
+    if entry and entry['digest'] == digest:
+        return None
+    return digest
+
 def extract_code_summary(py_file):
-    with open(py_file, 'r', encoding='utf-8') as f:
-        source = f.read()
+    source = py_file.read_text(encoding='utf-8')
     try:
-        tree = ast.parse(source)
+        tree = ast.parse(source, filename=str(py_file), type_comments=False)
     except Exception as e:
         return [], f"Parse error: {e}"
     items = []
-    for node in ast.walk(tree):
+    # Module-level definitions plus class methods; no need to walk every expression
+    nodes = list(tree.body)
+    for node in nodes:
         if isinstance(node, ast.ClassDef):
             doc = ast.get_docstring(node)
             items.append(f'- class {node.name}: "{doc or "No docstring"}"')
-        elif isinstance(node, ast.FunctionDef):
+            nodes.extend(node.body)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
             doc = ast.get_docstring(node)
             items.append(f'- def {node.name}(): "{doc or "No docstring"}"')
     return items, None
@@ -48,40 +101,63 @@ def call_ollama(prompt, model=OLLAMA_MODEL):
         'stream': False
     }
     try:
-        response = requests.post(OLLAMA_URL, json=data)
+        response = _SESSION.post(OLLAMA_URL, data=_dumps(data), timeout=300)
         response.raise_for_status()
-        result = response.json()
+        result = _loads(response.content)
         return result.get('response', '').strip()
     except Exception as e:
         return f"[Error calling Ollama: {e}]"
 
 def scan_codebase():
-    py_files = []
     for code_dir in CODE_DIRS:
         if code_dir.exists():
-            for path, _, files in os.walk(code_dir):
-                for file in files:
-                    if file.endswith('.py'):
-                        py_files.append(Path(path) / file)
-    return py_files
+            yield from code_dir.rglob('*.py')
 
 def main():
     ensure_docs_dir()
     py_files = scan_codebase()
-    stories = []
+    cache = load_story_cache()
+    new_cache = {}
+    # One slot per file in scan order; stale slots are filled once their story is known
+    sections = []
+    stale = []
     for py_file in py_files:
         rel_path = py_file.relative_to(PROJECT_ROOT)
-        items, error = extract_code_summary(py_file)
-        if error:
-            stories.append(f'## {rel_path}\n> Error: {error}\n---')
-            continue
-        if not items:
+        key = str(rel_path)
+        st = py_file.stat()
+        entry = cache.get(key)
+        digest = stale_digest(entry, py_file, st)
+        if digest is None:
+            new_cache[key] = dict(entry, mtime=st.st_mtime_ns, size=st.st_size)
+            sections.append(entry['story'])
             continue
-        prompt = PROMPT_TEMPLATE.format(filename=rel_path, items='\n'.join(items))
-        print(f"Generating story for {rel_path}...")
-        story = call_ollama(prompt)
-        stories.append(f'## {rel_path}\n{story}\n---')
+        meta = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'digest': digest}
+        stale.append((len(sections), py_file, rel_path, meta))
+        sections.append(None)
+    pending = []
+    # Parsing is CPU-bound, so it gets a process pool; map() yields summaries in
+    # order as they finish, and each prompt is handed to Ollama straight away
+    with ProcessPoolExecutor() as parsers, ThreadPoolExecutor(max_workers=OLLAMA_WORKERS) as executor:
+        summaries = parsers.map(extract_code_summary, [py_file for _, py_file, _, _ in stale], chunksize=16)
+        for (index, _, rel_path, meta), (items, error) in zip(stale, summaries):
+            if not error and items:
+                prompt = PROMPT_TEMPLATE.format(filename=rel_path, items='\n'.join(items))
+                print(f"Generating story for {rel_path}...")
+                pending.append((index, executor.submit(call_ollama, prompt), rel_path, meta))
+                continue
+            section = f'## {rel_path}\n> Error: {error}\n---' if error else None
+            sections[index] = section
+            new_cache[str(rel_path)] = dict(meta, story=section)
+        for index, future, rel_path, meta in pending:
+            story = future.result()
+            section = f'## {rel_path}\n{story}\n---'
+            sections[index] = section
+            # Failed Ollama calls aren't cached so they are retried on the next run
+            if not story.startswith('[Error calling Ollama'):
+                new_cache[str(rel_path)] = dict(meta, story=section)
+    stories = [section for section in sections if section is not None]
     OUTPUT_FILE.write_text('\n'.join(stories), encoding='utf-8')
+    save_story_cache(new_cache)
     print(f"Generated {OUTPUT_FILE} with stories for {len(stories)} Python files.")
     print("\nTo use a different model, edit OLLAMA_MODEL in generate_code_story.py.")
     print("Ensure Ollama is running locally and the model is pulled (e.g., 'ollama pull llama2').")
@@ -356,6 +356,22 @@ class WebSocketManager:
             if client_id not in exclude:
                 await self.send_message(client_id, message)
     
+    def _connected_socket(self, client_id: str) -> Optional[WebSocket]:
+        """Look up a client's socket, or return None if it is unknown or not connected."""
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            logger.warning(f"Client {client_id} not found")
+            return None
+        if websocket.client_state != WebSocketState.CONNECTED:
+            logger.warning(f"Client {client_id} not connected")
+            return None
+        return websocket
+
+    def _record_sent(self, client_id: str, message: Dict[str, Any]) -> None:
+        """Store a sent message in the client's history, skipping ping/pong."""
+        if message.get("type") not in ["ping", "pong"]:
+            self.message_queues[client_id].append(message)
+
     async def send_message(
         self,
         client_id: str,
@@ -371,29 +387,47 @@ class WebSocketManager:
             True if message was sent successfully
         """
         try:
-            if client_id not in self.active_connections:
-                logger.warning(f"Client {client_id} not found")
+            websocket = self._connected_socket(client_id)
+            if websocket is None:
                 return False
+            await websocket.send_json(message)
+            self._record_sent(client_id, message)
+            return True
 
-            websocket = self.active_connections[client_id]
-            if websocket.client_state != WebSocketState.CONNECTED:
-                logger.warning(f"Client {client_id} not connected")
-                return False
+        except Exception as e:
+            logger.error(f"Error sending message to {client_id}: {e}")
+            await self.disconnect(client_id)
+            return False
 
-            # For testing, if the websocket has a mock_receive method, use it
-            if hasattr(websocket, "mock_receive"):
-                await websocket.mock_receive(message)
-            else:
-                await websocket.send_json(message)
-            
-            # Only store non-ping/pong messages in history
-            if message.get("type") not in ["ping", "pong"]:
-                self.message_queues[client_id].append(message)
-            
+    async def send_messages(
+        self,
+        client_id: str,
+        messages: List[Dict[str, Any]]
+    ) -> bool:
+        """Send several messages to a specific client, in order.
+
+        The connection is looked up and checked once for the whole batch
+        rather than once per message as with repeated send_message calls.
+
+        Args:
+            client_id: Client ID
+            messages: Messages to send
+
+        Returns:
+            True if every message was sent successfully
+        """
+        try:
+            websocket = self._connected_socket(client_id)
+            if websocket is None:
+                return False
+            send = websocket.send_json
+            for message in messages:
+                await send(message)
+                self._record_sent(client_id, message)
             return True
 
         except Exception as e:
-            logger.error(f"Error sending message to {client_id}: {e}")
+            logger.error(f"Error sending messages to {client_id}: {e}")
             await self.disconnect(client_id)
             return False
 
@@ -4,7 +4,9 @@ Standalone script to test Anthropic's WebSocket API (Claude-3 streaming).
 
 Usage:
   export ANTHROPIC_API_KEY=your_real_key
-  python backend/scripts/anthropic_ws_direct.py
+  python backend/scripts/anthropic_ws_direct.py ["prompt" ...]
+
+Each prompt is sent over the same connection (default: "Hello, Claude!").
 
 This script will incur real API usage and should only be run intentionally.
 """
@@ -13,10 +15,17 @@ import sys
 import asyncio
 from tests.utils.real_websocket_client import RealWebSocketClient
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
 ANTHROPIC_WS_URI = os.getenv("ANTHROPIC_WS_URI", "wss://api.anthropic.com/v1/messages")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
-async def main():
+DEFAULT_PROMPTS = ["Hello, Claude!"]
+
+async def main(prompts):
     if not ANTHROPIC_API_KEY:
         print("No Anthropic API key set in ANTHROPIC_API_KEY")
         sys.exit(1)
@@ -25,26 +34,31 @@ async def main():
         "anthropic-version": "2023-06-01",
     }
     try:
+        # One connection for every prompt, so the TLS handshake is paid once
         async with RealWebSocketClient(uri=ANTHROPIC_WS_URI, headers=headers, debug=True) as client:
-            await client.send_json({
-                "model": "claude-3-opus-20240229",
-                "max_tokens": 1024,
-                "messages": [
-                    {"role": "user", "content": "Hello, Claude!"}
-                ],
-                "stream": True
-            })
-            got_response = False
-            for _ in range(3):
-                response = await client.receive_json()
-                print("Anthropic response:", response)
-                if response:
-                    got_response = True
-            assert got_response, "No response received from Anthropic API!"
+            for prompt in prompts:
+                await client.send_json({
+                    "model": "claude-3-opus-20240229",
+                    "max_tokens": 1024,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ],
+                    "stream": True
+                })
+                got_response = False
+                for _ in range(3):
+                    response = await client.receive_json()
+                    print("Anthropic response:", response)
+                    if response:
+                        got_response = True
+                assert got_response, f"No response received from Anthropic API for prompt {prompt!r}!"
             print("Anthropic API test PASSED")
     except Exception as e:
         print(f"Anthropic API test FAILED: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    if uvloop is not None:
+        # libuv readiness handling is cheaper per frame than the selector loop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(main(sys.argv[1:] or DEFAULT_PROMPTS)) 
\ No newline at end of file
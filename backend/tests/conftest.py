@@ -27,6 +27,11 @@ from app.core.auth import create_access_token
 from datetime import timedelta
 from app.core.config import Settings
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
 # Load test environment variables
 load_dotenv(Path(__file__).parent / ".env.test")
 
@@ -225,14 +230,6 @@ async def test_user(db: AsyncSession):
     await db.refresh(user)
     return user
 
-@pytest.fixture(scope="function", autouse=True)
-async def event_loop():
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    loop.close()
-
 @pytest_asyncio.fixture(scope="function")
 async def initialize_test_db():
     """Initialize test database with proper cleanup."""
@@ -310,16 +307,16 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "db_test: mark test as requiring database setup/teardown"
     )
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run tests sharing a group on one xdist worker"
+    )
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for tests."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """Policy for the session-wide event loop; uvloop when it is installed."""
+    if uvloop is not None and sys.platform != "win32":
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
 
 @pytest_asyncio.fixture(scope="function")
 async def initialize_test_db() -> None:
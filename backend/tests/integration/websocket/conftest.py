@@ -178,6 +178,17 @@ async def cleanup_helpers(test_helpers: List[WebSocketTestHelper]):
         for helper in test_helpers:
             await helper.cleanup()
 
+def pytest_collection_modifyitems(config, items):
+    """
+    Pin real WebSocket tests to a single xdist worker.
+
+    They share one server, so under ``pytest -n auto --dist=loadgroup`` they
+    must run serially; everything else is free to spread across workers.
+    """
+    for item in items:
+        if item.get_closest_marker("real_websocket") is not None:
+            item.add_marker(pytest.mark.xdist_group("ws"))
+
 @pytest.fixture(autouse=True)
 def enforce_websocket_mode(request):
     """
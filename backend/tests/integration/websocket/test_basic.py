@@ -229,7 +229,7 @@ async def test_message_sending(ws_helper):
     logger = logging.getLogger("test_message_sending")
     client_id = str(uuid.uuid4())
     ws = await ws_helper.connect(client_id=client_id)
-    logger.debug(f"[test_message_sending] Connected: client_id={client_id}, ws_state={ws.client_state}")
+    logger.debug("[test_message_sending] Connected: client_id=%s, ws_state=%s", client_id, ws.client_state)
     assert ws.client_state == WebSocketState.CONNECTED
     
     # Send a test message
@@ -238,14 +238,14 @@ async def test_message_sending(ws_helper):
         "content": "Hello, World!",
         "metadata": {}
     }
-    logger.debug(f"[test_message_sending] Sending message: {test_msg}")
-    logger.debug(f"[test_message_sending] State before send_json: {ws.client_state}")
+    logger.debug("[test_message_sending] Sending message: %s", test_msg)
+    logger.debug("[test_message_sending] State before send_json: %s", ws.client_state)
     response = await ws_helper.send_json(
         data=test_msg,
         client_id=client_id
     )
-    logger.debug(f"[test_message_sending] State after send_json: {ws.client_state}")
-    logger.debug(f"[test_message_sending] Received response: {response}")
+    logger.debug("[test_message_sending] State after send_json: %s", ws.client_state)
+    logger.debug("[test_message_sending] Received response: %s", response)
     assert response["type"] == "chat_message"
     assert response["content"] == "Hello, World!"
     
@@ -117,7 +117,8 @@ async def test_generic_error_handler_direct(mock_request):
 
 # --- Pydantic Validation Test (Requires Route) ---
 
-@pytest.fixture
+# The app is stateless, so it is built once per session rather than per test
+@pytest.fixture(scope="session")
 def pydantic_test_app():
     """Minimal app fixture ONLY for the Pydantic validation test."""
     app = FastAPI()
@@ -130,7 +131,7 @@ def pydantic_test_app():
         return {"message": "Valid data"}
     return app
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pydantic_test_client(pydantic_test_app):
     """Client fixture ONLY for the Pydantic validation test."""
     return TestClient(pydantic_test_app, raise_server_exceptions=False)
@@ -1,5 +1,4 @@
 import pytest
-import time
 from redis.exceptions import WatchError, RedisError
 from tests.utils.mock_redis import MockRedis
 import asyncio
@@ -10,9 +10,8 @@ from app.core.websocket_rate_limiter import WebSocketRateLimiter
 from tests.utils.websocket_test_helper import WebSocketTestHelper, MockWebSocket
 import os
 
-@pytest.fixture
-def mock_redis():
-    """Get mock Redis client."""
+def _make_mock_redis() -> AsyncMock:
+    """Build an AsyncMock Redis client with the default return values."""
     redis = AsyncMock()
     redis.get.return_value = None
     redis.set.return_value = True
@@ -23,6 +22,11 @@ def mock_redis():
     redis.flushdb.return_value = True
     return redis
 
+@pytest.fixture
+def mock_redis():
+    """Get mock Redis client."""
+    return _make_mock_redis()
+
 @pytest.fixture
 async def websocket_manager(mock_redis) -> AsyncGenerator[WebSocketManager, None]:
     """Get WebSocket manager instance with mock Redis."""
@@ -75,6 +79,31 @@ async def ws_helper(
     finally:
         await helper.cleanup()
 
+@pytest.fixture(scope="module")
+async def module_ws_helper() -> AsyncGenerator[WebSocketTestHelper, None]:
+    """WebSocket test helper and manager built once per test module.
+
+    MockWebSockets are pooled: cleanup() releases them and the next connect()
+    reuses one through MockWebSocket.reset().
+    """
+    manager = WebSocketManager(redis_client=_make_mock_redis())
+    helper = WebSocketTestHelper(websocket_manager=manager, mock_mode=True, mock_pool=[])
+    try:
+        yield helper
+    finally:
+        await helper.cleanup()
+        await manager.clear_all_connections()
+
+@pytest.fixture
+async def shared_ws_helper(module_ws_helper: WebSocketTestHelper) -> AsyncGenerator[WebSocketTestHelper, None]:
+    """Module-shared WebSocket test helper, disconnected and reset after each test."""
+    try:
+        yield module_ws_helper
+    finally:
+        await module_ws_helper.cleanup()
+        await module_ws_helper.websocket_manager.clear_all_connections()
+        module_ws_helper.reset()
+
 @pytest.fixture(autouse=True)
 async def cleanup_helpers(test_helpers: List[WebSocketTestHelper]):
     """Automatically clean up all test helpers."""
@@ -104,6 +104,39 @@ class TestWebSocketSystemMessages:
         
         await ws_helper.cleanup()
     
+    async def test_system_message_batch(self, shared_ws_helper: WebSocketTestHelper):
+        """Test sending several system messages in one batch."""
+        client_id = str(uuid.uuid4())
+
+        # Create connection
+        success = await shared_ws_helper.connect(client_id=client_id, token="mock-token")
+        assert success, "Connection should succeed"
+
+        messages = [
+            {"type": "system", "content": f"batch {i}", "metadata": {"system_type": "test"}}
+            for i in range(5)
+        ]
+        responses = await shared_ws_helper.send_batch(client_id, messages)
+        assert [r["type"] for r in responses] == ["system"] * 5
+        assert [r["content"] for r in responses] == [f"batch {i}" for i in range(5)]
+
+    async def test_shared_helper_reuses_released_mocks(self, shared_ws_helper: WebSocketTestHelper):
+        """Test that a mock released by cleanup() serves the next connection after reset()."""
+        first = await shared_ws_helper.connect(client_id=str(uuid.uuid4()), token="mock-token")
+        await shared_ws_helper.cleanup()
+
+        client_id = str(uuid.uuid4())
+        second = await shared_ws_helper.connect(client_id=client_id, token="mock-token")
+        assert second is first
+        assert second.client_id == client_id
+        assert second.client_state == WebSocketState.CONNECTED
+
+        response = await shared_ws_helper.send_json(
+            data={"type": "system", "content": "after reuse", "metadata": {"system_type": "test"}},
+            client_id=client_id
+        )
+        assert response["content"] == "after reuse"
+
     async def test_system_message_types(self, websocket_manager: WebSocketManager, ws_helper: WebSocketTestHelper):
         """Test different system message types."""
         rate_limiter = WebSocketRateLimiter(
@@ -1,7 +1,6 @@
 """Mock Redis implementation for testing."""
 import asyncio
 import time
-import re
 from typing import Dict, List, Any, Optional, Set, Union, Callable
 from redis.exceptions import WatchError, RedisError
 import json
@@ -32,6 +31,25 @@ class MockRedis:
             bytes: self._handle_bytes
         }
         self._pubsub_channels: Dict[str, List[asyncio.Queue]] = {}
+        self.sync = _SyncView(self)
+
+    def _now(self) -> float:
+        """Current time used for expiry; tests may monkeypatch this to control the clock."""
+        return time.time()
+
+    def reset(self) -> None:
+        """Clear all data, transaction, error and pub/sub state so the instance can be reused."""
+        self._data.clear()
+        self._expires.clear()
+        self._lists.clear()
+        self._watched_keys.clear()
+        self._watched_values.clear()
+        self._transaction_data.clear()
+        self._pipeline_commands = []
+        self._in_transaction = False
+        self._transaction_failed = False
+        self._error_mode = False
+        self._pubsub_channels.clear()
     
     def _encode_key(self, key: Union[str, bytes]) -> bytes:
         """Encode key to bytes."""
@@ -59,7 +77,7 @@ class MockRedis:
     def _check_expiry(self, key: bytes) -> bool:
         """Check if key has expired."""
         if key in self._expires:
-            if time.time() > self._expires[key]:
+            if self._now() > self._expires[key]:
                 del self._data[key]
                 del self._expires[key]
                 return True
@@ -155,6 +173,14 @@ class MockRedis:
         ex: Optional[int] = None
     ) -> bool:
         """Set key to value with optional expiry. Always store as bytes."""
+        return self._set_impl(key, value, ex)
+
+    def _set_impl(
+        self,
+        key: Union[str, bytes],
+        value: Any,
+        ex: Optional[int] = None
+    ) -> bool:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
         key = self._encode_key(key)
@@ -167,11 +193,14 @@ class MockRedis:
         if ex is not None:
             if ex <= 0:
                 raise RedisError("Invalid expire time")
-            self._expires[key] = time.time() + ex
+            self._expires[key] = self._now() + ex
         return True
     
     async def get(self, key: Union[str, bytes]) -> Optional[bytes]:
         """Get value for key. Always return bytes or None."""
+        return self._get_impl(key)
+
+    def _get_impl(self, key: Union[str, bytes]) -> Optional[bytes]:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
         key = self._encode_key(key)
@@ -189,6 +218,9 @@ class MockRedis:
 
     async def delete(self, *keys: bytes) -> int:
         """Delete keys and return the count of deleted keys. Debug output for test diagnosis."""
+        return self._delete_impl(*keys)
+
+    def _delete_impl(self, *keys: bytes) -> int:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
         if self._in_transaction:
@@ -219,11 +251,14 @@ class MockRedis:
         if key in self._watched_keys and key in self._watched_values:
             if self._watched_values[key] != self._data.get(key):
                 raise WatchError()
-        self._expires[key] = time.time() + seconds
+        self._expires[key] = self._now() + seconds
         return True
     
     async def hset(self, key: Union[str, bytes], field: Any, value: Any) -> int:
         """Set hash field to value."""
+        return self._hset_impl(key, field, value)
+
+    def _hset_impl(self, key: Union[str, bytes], field: Any, value: Any) -> int:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
         key = self._encode_key(key)
@@ -247,6 +282,9 @@ class MockRedis:
     
     async def hget(self, key: Union[str, bytes], field: Any) -> Any:
         """Get value of hash field."""
+        return self._hget_impl(key, field)
+
+    def _hget_impl(self, key: Union[str, bytes], field: Any) -> Any:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
             
@@ -269,6 +307,9 @@ class MockRedis:
     
     async def hgetall(self, key: Union[str, bytes]) -> dict:
         """Get all fields and values in hash."""
+        return self._hgetall_impl(key)
+
+    def _hgetall_impl(self, key: Union[str, bytes]) -> dict:
         if self._error_mode:
             raise RedisError("Redis error (mock)")
             
@@ -322,6 +363,9 @@ class MockRedis:
     
     async def lpush(self, key: Union[str, bytes], *values: Any) -> int:
         """Push values to the head of a list."""
+        return self._lpush_impl(key, *values)
+
+    def _lpush_impl(self, key: Union[str, bytes], *values: Any) -> int:
         key = self._encode_key(key)
         if self._in_transaction:
             self._pipeline_commands.append(("lpush", key, *values))
@@ -337,6 +381,9 @@ class MockRedis:
     
     async def lpop(self, key: bytes) -> Optional[bytes]:
         """Pop value from the head of a list and return as bytes."""
+        return self._lpop_impl(key)
+
+    def _lpop_impl(self, key: bytes) -> Optional[bytes]:
         if key not in self._lists or not self._lists[key]:
             return None
         value = self._lists[key].pop(0)
@@ -344,6 +391,9 @@ class MockRedis:
     
     async def lrange(self, key: Union[str, bytes], start: int, stop: int) -> list:
         """Get a range of values from a list, all as bytes."""
+        return self._lrange_impl(key, start, stop)
+
+    def _lrange_impl(self, key: Union[str, bytes], start: int, stop: int) -> list:
         key = self._encode_key(key)
         # Type check: must be a list
         if key in self._data and not isinstance(self._data[key], list):
@@ -434,14 +484,20 @@ class MockRedis:
     
     async def exists(self, *keys: bytes) -> int:
         """Check if keys exist."""
+        return self._exists_impl(*keys)
+
+    def _exists_impl(self, *keys: bytes) -> int:
         count = 0
         for key in keys:
-            if key in self._data and (key not in self._expires or self._expires[key] > time.time()):
+            if key in self._data and (key not in self._expires or self._expires[key] > self._now()):
                 count += 1
         return count
     
     async def rpush(self, key: Union[str, bytes], *values: Any) -> int:
         """Push values to the tail of a list."""
+        return self._rpush_impl(key, *values)
+
+    def _rpush_impl(self, key: Union[str, bytes], *values: Any) -> int:
         key = self._encode_key(key)
         if self._in_transaction:
             self._pipeline_commands.append(("rpush", key, *values))
@@ -457,6 +513,9 @@ class MockRedis:
     
     async def rpop(self, key: bytes) -> Optional[bytes]:
         """Pop value from the tail of a list and return as bytes."""
+        return self._rpop_impl(key)
+
+    def _rpop_impl(self, key: bytes) -> Optional[bytes]:
         if key not in self._lists or not self._lists[key]:
             return None
         value = self._lists[key].pop()
@@ -489,7 +548,7 @@ class MockRedis:
             return -2
         if key not in self._expires:
             return -1
-        ttl = int(self._expires[key] - time.time())
+        ttl = int(self._expires[key] - self._now())
         return ttl if ttl > 0 else -2
 
     async def pttl(self, key: Union[str, bytes]) -> int:
@@ -499,7 +558,7 @@ class MockRedis:
             return -2
         if key not in self._expires:
             return -1
-        pttl = int((self._expires[key] - time.time()) * 1000)
+        pttl = int((self._expires[key] - self._now()) * 1000)
         return pttl if pttl > 0 else -2 
 
     async def incr(self, key: Union[str, bytes]) -> int:
@@ -573,7 +632,7 @@ class MockRedis:
         if ex is not None:
             if ex <= 0:
                 raise RedisError("Invalid expire time")
-            self._expires[key] = time.time() + ex
+            self._expires[key] = self._now() + ex
         return True
 
     # --- _apply_* methods for transaction execution ---
@@ -586,7 +645,7 @@ class MockRedis:
     async def _apply_expire(self, key, seconds):
         if key not in self._data:
             return False
-        self._expires[key] = time.time() + seconds
+        self._expires[key] = self._now() + seconds
         return True
 
     async def _apply_hset(self, key, field, value):
@@ -652,6 +711,53 @@ class MockRedis:
             return self._encode_value(value)
         return value
 
+class _SyncView:
+    """Synchronous shadow of the CPU-only MockRedis commands.
+
+    ``mock_redis.sync.set(...)`` returns the result directly instead of a
+    coroutine, for tests that don't exercise async behaviour.
+    """
+    __slots__ = ("_redis",)
+
+    def __init__(self, redis: 'MockRedis'):
+        self._redis = redis
+
+    def set(self, key, value, ex=None):
+        return self._redis._set_impl(key, value, ex)
+
+    def get(self, key):
+        return self._redis._get_impl(key)
+
+    def delete(self, *keys):
+        return self._redis._delete_impl(*keys)
+
+    def exists(self, *keys):
+        return self._redis._exists_impl(*keys)
+
+    def hset(self, key, field, value):
+        return self._redis._hset_impl(key, field, value)
+
+    def hget(self, key, field):
+        return self._redis._hget_impl(key, field)
+
+    def hgetall(self, key):
+        return self._redis._hgetall_impl(key)
+
+    def lpush(self, key, *values):
+        return self._redis._lpush_impl(key, *values)
+
+    def lpop(self, key):
+        return self._redis._lpop_impl(key)
+
+    def rpush(self, key, *values):
+        return self._redis._rpush_impl(key, *values)
+
+    def rpop(self, key):
+        return self._redis._rpop_impl(key)
+
+    def lrange(self, key, start, stop):
+        return self._redis._lrange_impl(key, start, stop)
+
 class MockTransaction:
     def __init__(self, redis, watched_keys=None, watched_values=None):
         self.redis = redis
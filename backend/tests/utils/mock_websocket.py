@@ -1,7 +1,7 @@
 """Mock WebSocket implementation for testing."""
 import json
 import logging
-from typing import Dict, Any, Optional, List, AsyncIterator
+from typing import Dict, Any, Optional, List, NamedTuple
 from starlette.websockets import WebSocketState
 from websockets.exceptions import ConnectionClosed
 from websockets.frames import Close
@@ -11,10 +11,29 @@ import asyncio
 import traceback
 import os
 
+# Only decoding goes through orjson. Frames are still encoded with
+# json.dumps(allow_nan=False): orjson writes NaN and infinity as null, and
+# test_invalid_json_handling relies on them being rejected
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    _loads = json.JSONDecoder().decode
+
 logger = logging.getLogger(__name__)
 
+# Fixed-schema frames; only the single value slot is serialized per message
+_ERROR_TMPL = '{"type": "error", "content": %s}'
+_PONG_TMPL = '{"type": "pong", "timestamp": %s}'
+
+# Valid message types that need no handling at all
+_NO_OP_TYPES = frozenset({"pong"})
+
 class MockContentBlock:
     """Mock content block that matches Anthropic's format."""
+    __slots__ = ("type", "text")
+
     def __init__(self, text: str, block_type: str = "text"):
         self.type = block_type
         self.text = text
@@ -27,6 +46,7 @@ class MockContentBlock:
 
 class MockStreamResponse:
     """Mock stream response generator."""
+    __slots__ = ("content", "chunk_size", "position")
     DEBUG_LOGGING = True  # Set to False to disable debug prints
 
     def __init__(self, content: str, chunk_size: int = 5):
@@ -81,17 +101,59 @@ class MockStreamResponse:
             "metadata": {}
         }
 
+class _EchoSchema(NamedTuple):
+    """Shape of the echo MockWebSocket sends back for a simple message type."""
+    rate_limited: bool
+    close_on_limit: bool
+    echo_user_id: bool
+    timestamped: bool
+    default_content: str = ""
+
+_ECHO_SCHEMAS: Dict[str, _EchoSchema] = {
+    "chat": _EchoSchema(rate_limited=True, close_on_limit=False, echo_user_id=True, timestamped=True),
+    "test": _EchoSchema(rate_limited=True, close_on_limit=True, echo_user_id=True, timestamped=True),
+    "system": _EchoSchema(rate_limited=False, close_on_limit=False, echo_user_id=False, timestamped=True),
+    "typing": _EchoSchema(rate_limited=False, close_on_limit=False, echo_user_id=False, timestamped=False, default_content="true"),
+}
+
+class _MockClient:
+    """Client address info exposed as ``websocket.client``."""
+    __slots__ = ("host", "port", "client")
+
+    def __init__(self, ip_address: str):
+        self.host = ip_address
+        self.port = 12345
+        self.client = f"{ip_address}:12345"
+
 class MockWebSocket:
     """Mock WebSocket implementation for testing."""
+    __slots__ = (
+        "client_id", "user_id", "ip_address", "query_params", "_query_params_list",
+        "client_state", "send_queue", "receive_queue", "closed", "close_code",
+        "close_reason", "headers", "_client", "_receive_task", "_loop", "_auto_pong",
+        "_message_handlers", "_current_stream", "_stream_start_event", "_closed_event",
+        "_state_changed",
+        "_stream_timestamps", "max_streams_per_minute", "_message_timestamps",
+        "max_messages_per_minute", "max_messages_per_second", "response_delay",
+        "_last_stream_start_metadata", "simulate_connect_error",
+    )
     DEBUG_LOGGING = True  # Set to False to disable debug prints
     DEBUG_STACK_TRACES = False  # Set to True to enable stack trace logging
 
     def debug_log(self, msg, stack_trace: bool = False):
-        if self.DEBUG_LOGGING:
-            logger.debug(msg)
-            if stack_trace and self.DEBUG_STACK_TRACES:
-                import traceback
-                logger.debug('Stack trace:\n' + ''.join(traceback.format_stack()))
+        if not self.DEBUG_LOGGING:
+            return
+        logger.debug(msg)
+        if stack_trace and self.DEBUG_STACK_TRACES:
+            self._log_stack()
+
+    def _log_stack(self):
+        # Cap the captured depth; formatting the full stack is the expensive part
+        stack = traceback.extract_stack(limit=12)
+        logger.debug('Stack trace:\n' + ''.join(traceback.format_list(stack)))
+
+    def _debug_enabled(self) -> bool:
+        return self.DEBUG_LOGGING and logger.isEnabledFor(logging.DEBUG)
 
     def __init__(
         self,
@@ -108,13 +170,65 @@ class MockWebSocket:
             ip_address: IP address
             query_params: Optional query parameters
         """
+        # Allocated once per instance; reset() empties them rather than replacing them
+        self.send_queue: asyncio.Queue[str] = asyncio.Queue()
+        self.receive_queue: asyncio.Queue[str] = asyncio.Queue()
+        self._stream_start_event = asyncio.Event()
+        self._closed_event = asyncio.Event()
+        self._state_changed = asyncio.Event()  # Pulsed on every client_state transition
+        self._stream_timestamps: List[float] = []  # For simple rate limiting
+        self._message_timestamps: List[float] = []  # For message rate limiting
+        self._receive_task: Optional[asyncio.Task] = None
+        self._message_handlers: Dict[str, Any] = {
+            "ping": self._handle_ping,
+            "chat_message": self._handle_chat_message,
+            "chat": self._echo,
+            "typing": self._echo,
+            "stream_start": self._handle_stream_start,
+            "stream": self._handle_stream,
+            "stream_end": self._handle_stream_end,
+            "system": self._echo,
+            "test": self._echo
+        }
+        self.reset(client_id, user_id, ip_address, query_params)
+        self.debug_log(f"[MockWebSocket] __init__ called for client_id={client_id}, user_id={user_id}, simulate_connect_error={self.simulate_connect_error}")
+
+    def reset(
+        self,
+        client_id: str,
+        user_id: str,
+        ip_address: str = "127.0.0.1",
+        query_params: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Return the mock to its just-constructed state for another connection.
+
+        Queues, events and timestamp lists are emptied in place. Every other
+        per-connection field goes back to its default, including limits and
+        delays a previous test patched.
+
+        Args:
+            client_id: Client ID
+            user_id: User ID
+            ip_address: IP address
+            query_params: Optional query parameters
+        """
+        if self._receive_task is not None and not self._receive_task.done():
+            self._receive_task.cancel()
+        self._receive_task = None
+        for queue in (self.send_queue, self.receive_queue):
+            while not queue.empty():
+                queue.get_nowait()
+        self._stream_start_event.clear()
+        self._closed_event.clear()
+        self._state_changed.clear()
+        self._stream_timestamps.clear()
+        self._message_timestamps.clear()
         self.client_id = client_id
         self.user_id = user_id
         self.ip_address = ip_address
-        self.query_params = query_params or {}
+        self.query_params = query_params if query_params is not None else {}
+        self._query_params_list: Dict[str, List[str]] = {k: [v] for k, v in self.query_params.items()}
         self.client_state = WebSocketState.CONNECTING
-        self.send_queue: asyncio.Queue[str] = asyncio.Queue()
-        self.receive_queue: asyncio.Queue[str] = asyncio.Queue()
         self.closed = False
         self.close_code = None
         self.close_reason = None
@@ -123,31 +237,11 @@ class MockWebSocket:
             "X-User-ID": user_id,
             "X-Real-IP": ip_address
         }
-        self._client = type('Client', (), {
-            'host': ip_address,
-            'port': 12345,
-            'client': f"{ip_address}:12345"
-        })
-        self._receive_task: Optional[asyncio.Task] = None
+        self._client = _MockClient(ip_address)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._auto_pong = True  # Always enabled for test stability
-        self._message_handlers: Dict[str, Any] = {
-            "ping": self._handle_ping,
-            "pong": self._handle_pong,
-            "chat_message": self._handle_chat_message,
-            "chat": self._handle_chat,
-            "typing": self._handle_typing,
-            "stream_start": self._handle_stream_start,
-            "stream": self._handle_stream,
-            "stream_end": self._handle_stream_end,
-            "system": self._handle_system,
-            "test": self._handle_test_message
-        }
         self._current_stream: Optional[MockStreamResponse] = None
-        self._stream_lock = asyncio.Lock()
-        self._stream_start_event = asyncio.Event()
-        self._stream_timestamps: List[float] = []  # For simple rate limiting
         self.max_streams_per_minute: int = 60  # Default, can be patched in tests
-        self._message_timestamps: List[float] = []  # For message rate limiting
         self.max_messages_per_minute: int = 60  # Default, can be patched in tests
         self.max_messages_per_second: int = 10  # Default, can be patched in tests
         self.response_delay: float = 0.0  # Add configurable response delay
@@ -155,7 +249,6 @@ class MockWebSocket:
         self.simulate_connect_error = (
             os.environ.get("MOCK_WS_CONNECT_ERROR", "0").lower() in ("1", "true", "yes")
         )
-        self.debug_log(f"[MockWebSocket] __init__ called for client_id={client_id}, user_id={user_id}, simulate_connect_error={self.simulate_connect_error}")
 
     @property
     def application_state(self) -> WebSocketState:
@@ -187,15 +280,21 @@ class MockWebSocket:
             code: Close status code
             reason: Close reason
         """
-        prev_state = self.client_state
-        self.debug_log(f"[MockWebSocket] close ENTRY: client_id={self.client_id}, id={id(self)}, prev_state={prev_state}, current state={self.client_state}, code={code}, reason={reason}", stack_trace=True)
+        if self._debug_enabled():
+            logger.debug(
+                "[MockWebSocket] close ENTRY: client_id=%s, id=%s, current state=%s, code=%s, reason=%s",
+                self.client_id, id(self), self.client_state, code, reason
+            )
+            if self.DEBUG_STACK_TRACES:
+                self._log_stack()
         if self.client_state != WebSocketState.DISCONNECTED:
             self.set_client_state(WebSocketState.DISCONNECTED, context="close")
             self.closed = True
             self.close_code = code
             self.close_reason = reason
             self.debug_log(f"[MockWebSocket] close after set_client_state: client_id={self.client_id}, new state={self.client_state}")
-            # Cancel receive task if running
+            # Wake pending receivers first, then cancel the receive task if running
+            self._closed_event.set()
             if self._receive_task and not self._receive_task.done():
                 self._receive_task.cancel()
         else:
@@ -229,11 +328,25 @@ class MockWebSocket:
                 return "Missing message content"
             if isinstance(content, str) and len(content.encode("utf-8")) > 1024 * 1024:
                 return "Message size exceeds limit"
-        if message_type not in self._message_handlers:
+        if message_type not in self._message_handlers and message_type not in _NO_OP_TYPES:
             return f"Unknown message type: {message_type}"
         return None
 
     async def send_json(self, data: Dict[str, Any]) -> None:
+        """Push a server-to-client message onto the send queue.
+
+        This is push-only: no handler is dispatched. Use
+        inject_client_message to simulate a message arriving from the client.
+        The one exception is a server heartbeat ping: with auto-pong enabled the
+        simulated client answers it, so a pong is queued in place of the ping.
+
+        Args:
+            data: Message to send
+
+        Raises:
+            ConnectionClosed: If connection is closed
+            ValueError: If the message is not JSON serializable
+        """
         self.debug_log(f"[MockWebSocket] send_json ENTRY: data={data} (id={id(data)}), client_state={self.client_state}")
         if self.client_state != WebSocketState.CONNECTED:
             self.debug_log(f"[MockWebSocket] send_json ABORT: not connected, state={self.client_state}")
@@ -241,31 +354,16 @@ class MockWebSocket:
                 Close(code=status.WS_1006_ABNORMAL_CLOSURE, reason="WebSocket not connected"),
                 None
             )
-        # Do not dispatch error messages to handlers
-        if data.get("type") == "error":
-            try:
-                await self.send_queue.put(json.dumps(data, allow_nan=False))
-            except (TypeError, ValueError) as e:
-                logger.error(f"[MockWebSocket] send_json: JSON serialization error for error message: {e}")
-                raise ValueError(f"Invalid JSON in error message: {e}")
-            self.debug_log(f"[MockWebSocket] send_json: Skipping handler dispatch for error message: {data}")
+        if data.get("type") == "ping" and self._auto_pong:
+            # WebSocketManager._heartbeat reads the reply back with receive_json
+            await self._handle_ping(data)
             return
-        error = self._validate_message(data)
-        if error:
-            await self.send_error(error, close=False)
-            return
-        message_type = data["type"]
-        handler = self._message_handlers[message_type]
-        self.debug_log(f"[MockWebSocket] send_json: Before put to send_queue (id={id(self.send_queue)})")
         try:
             await self.send_queue.put(json.dumps(data, allow_nan=False))
         except (TypeError, ValueError) as e:
             logger.error(f"[MockWebSocket] send_json: JSON serialization error: {e}")
             raise ValueError(f"Invalid JSON in message: {e}")
-        self.debug_log(f"[MockWebSocket] send_json after put: {data} (id={id(data)}) send_queue size={self.send_queue.qsize()}")
-        self.debug_log(f"[MockWebSocket] send_json: Calling handler for type={message_type}")
-        await handler(data)
-        self.debug_log(f"[MockWebSocket] send_json EXIT: data={data} (id={id(data)}), client_state={self.client_state}")
+        self.debug_log(f"[MockWebSocket] send_json EXIT: data={data} (id={id(data)}) send_queue size={self.send_queue.qsize()}")
 
     async def receive_text(self) -> str:
         """Receive text data.
@@ -279,22 +377,30 @@ class MockWebSocket:
                 None
             )
 
+        # Create receive task if not exists
+        if not self._receive_task or self._receive_task.done():
+            self._receive_task = asyncio.create_task(self.receive_queue.get())
+        receive_task = self._receive_task
+
+        # Race the data against close() so a closing socket wakes us immediately
+        closed_waiter = asyncio.ensure_future(self._closed_event.wait())
         try:
-            # Create receive task if not exists
-            if not self._receive_task or self._receive_task.done():
-                self._receive_task = asyncio.create_task(self.receive_queue.get())
-
-            # Wait for data
-            return await self._receive_task
-
-        except asyncio.CancelledError:
-            # Only raise ConnectionClosed if we're actually closed
-            if self.closed:
-                raise ConnectionClosed(
-                    Close(code=self.close_code or status.WS_1006_ABNORMAL_CLOSURE, reason=self.close_reason or "Operation cancelled"),
-                    None
-                )
-            raise
+            done, _ = await asyncio.wait(
+                {receive_task, closed_waiter},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            closed_waiter.cancel()
+
+        if receive_task in done and not receive_task.cancelled():
+            return receive_task.result()
+        # Only raise ConnectionClosed if we're actually closed
+        if self.closed:
+            raise ConnectionClosed(
+                Close(code=self.close_code or status.WS_1006_ABNORMAL_CLOSURE, reason=self.close_reason or "Operation cancelled"),
+                None
+            )
+        raise asyncio.CancelledError()
 
     async def receive_json(self) -> Dict[str, Any]:
         self.debug_log(f"[MockWebSocket] receive_json ENTRY: client_state={self.client_state}")
@@ -307,7 +413,7 @@ class MockWebSocket:
         self.debug_log(f"[MockWebSocket] receive_json: Before get from send_queue (id={id(self.send_queue)})")
         text = await self.send_queue.get()
         self.debug_log(f"[MockWebSocket] receive_json: Got text from send_queue: {text}")
-        parsed = json.loads(text)
+        parsed = _loads(text)
         self.debug_log(f"[MockWebSocket] receive_json parsed: {parsed}")
         self.debug_log(f"[MockWebSocket] receive_json EXIT: parsed={parsed}, client_state={self.client_state}")
         return parsed
@@ -315,11 +421,16 @@ class MockWebSocket:
     def set_client_state(self, new_state, context=""):
         prev_state = self.client_state
         self.client_state = new_state
-        self.debug_log(f"[MockWebSocket] set_client_state called for client_id={self.client_id}, id={id(self)}, prev_state={prev_state}, new_state={new_state}, context={context}", stack_trace=True)
-        if new_state == WebSocketState.CONNECTED:
-            self.debug_log(f"[MockWebSocket] set_client_state CONNECTED stack trace (again):", stack_trace=True)
-        if new_state == WebSocketState.DISCONNECTED:
-            self.debug_log(f"[MockWebSocket] set_client_state DISCONNECTED stack trace (again):", stack_trace=True)
+        # Wake anyone in WebSocketTestHelper.wait_for_state; clearing leaves woken waiters woken
+        self._state_changed.set()
+        self._state_changed.clear()
+        if self._debug_enabled():
+            logger.debug(
+                "[MockWebSocket] set_client_state called for client_id=%s, id=%s, prev_state=%s, new_state=%s, context=%s",
+                self.client_id, id(self), prev_state, new_state, context
+            )
+            if self.DEBUG_STACK_TRACES:
+                self._log_stack()
 
     async def send_error(self, message: str, code: int = status.WS_1008_POLICY_VIOLATION, close: bool = True) -> None:
         """Send error message and optionally close connection.
@@ -332,17 +443,23 @@ class MockWebSocket:
         self.debug_log(f"[MockWebSocket] send_error called with message: {message} (id={id(message)})")
         try:
             # Put error message directly on the send queue to avoid recursion
-            error_msg = {"type": "error", "content": str(message)}
-            await self.send_queue.put(json.dumps(error_msg, allow_nan=False))
+            await self.send_queue.put(_ERROR_TMPL % json.dumps(str(message)))
             self.debug_log(f"[MockWebSocket] send_error after put: message={message} (id={id(message)})")
         finally:
             if close:
                 await self.close(code=code, reason=message)
 
-    async def mock_receive(self, data: Dict[str, Any]) -> None:
-        self.debug_log(f"[MockWebSocket] mock_receive ENTRY: data={data}, client_state={self.client_state}")
+    async def inject_client_message(self, data: Dict[str, Any]) -> None:
+        """Simulate a client-to-server message by dispatching it to its handler.
+
+        The message itself is not queued; only what the handler emits is.
+
+        Args:
+            data: Message received from the client
+        """
+        self.debug_log(f"[MockWebSocket] inject_client_message ENTRY: data={data}, client_state={self.client_state}")
         if self.client_state != WebSocketState.CONNECTED:
-            self.debug_log(f"[MockWebSocket] mock_receive ABORT: not connected, state={self.client_state}")
+            self.debug_log(f"[MockWebSocket] inject_client_message ABORT: not connected, state={self.client_state}")
             raise ConnectionClosed(
                 Close(code=status.WS_1006_ABNORMAL_CLOSURE, reason="WebSocket not connected"),
                 None
@@ -350,30 +467,29 @@ class MockWebSocket:
         # Do not dispatch error messages to handlers
         if data.get("type") == "error":
             await self.send_queue.put(json.dumps(data, allow_nan=False))
-            self.debug_log(f"[MockWebSocket] mock_receive: Skipping handler dispatch for error message: {data}")
+            self.debug_log(f"[MockWebSocket] inject_client_message: Skipping handler dispatch for error message: {data}")
             return
         if data.get("type") == "ping":
-            await self.send_json({
-                "type": "pong",
-                "timestamp": datetime.now(UTC).isoformat()
-            })
-            self.debug_log(f"[MockWebSocket] mock_receive EXIT: handled ping, client_state={self.client_state}")
+            await self.send_queue.put(_PONG_TMPL % json.dumps(datetime.now(UTC).isoformat()))
+            self.debug_log(f"[MockWebSocket] inject_client_message EXIT: handled ping, client_state={self.client_state}")
             return
         error = self._validate_message(data)
         if error:
             await self.send_error(error, close=False)
             return
         message_type = data["type"]
+        if message_type in _NO_OP_TYPES:
+            return
         handler = self._message_handlers[message_type]
-        self.debug_log(f"[MockWebSocket] mock_receive: Calling handler for type={message_type}")
+        self.debug_log(f"[MockWebSocket] inject_client_message: Calling handler for type={message_type}")
         await handler(data)
-        self.debug_log(f"[MockWebSocket] mock_receive EXIT: data={data}, client_state={self.client_state}")
+        self.debug_log(f"[MockWebSocket] inject_client_message EXIT: data={data}, client_state={self.client_state}")
 
     async def mock_send(self) -> Dict[str, Any]:
         self.debug_log(f"[MockWebSocket] mock_send ENTRY: client_state={self.client_state}")
         text = await self.send_queue.get()
         self.debug_log(f"[MockWebSocket] mock_send got from send_queue: {text}")
-        parsed = json.loads(text)
+        parsed = _loads(text)
         self.debug_log(f"[MockWebSocket] mock_send parsed: {parsed}")
         self.debug_log(f"[MockWebSocket] mock_send EXIT: parsed={parsed}, client_state={self.client_state}")
         return parsed
@@ -395,7 +511,7 @@ class MockWebSocket:
         Returns:
             Query parameters
         """
-        return {k: [v] for k, v in self.query_params.items()}
+        return self._query_params_list
 
     def get_path_params(self) -> Dict[str, str]:
         """Get path parameters.
@@ -438,14 +554,18 @@ class MockWebSocket:
             data: Ping message data
         """
         if self._auto_pong:
-            await self.send_json({
-                "type": "pong",
-                "timestamp": datetime.now(UTC).isoformat()
-            })
+            await self.send_queue.put(_PONG_TMPL % json.dumps(datetime.now(UTC).isoformat()))
+
+    def _now(self) -> float:
+        """Get the current event loop time, caching the running loop on first use."""
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
+        return loop.time()
 
     def _check_rate_limit(self, timestamps: List[float], max_per_minute: int, max_per_second: int) -> Optional[str]:
         """Generic rate limit checker. Returns error string if not allowed, else None."""
-        now = asyncio.get_event_loop().time()
+        now = self._now()
         # Clean up old timestamps
         timestamps[:] = [t for t in timestamps if now - t < 60]
         # Per-minute limit
@@ -463,6 +583,35 @@ class MockWebSocket:
             return None  # System messages bypass rate limiting
         return self._check_rate_limit(self._message_timestamps, self.max_messages_per_minute, self.max_messages_per_second)
 
+    async def _echo(self, data: Dict[str, Any]) -> None:
+        """Echo a chat, test, system or typing message back, shaped by _ECHO_SCHEMAS."""
+        message_type = data["type"]
+        schema = _ECHO_SCHEMAS[message_type]
+        self.debug_log(f"[MockWebSocket] _echo called for type={message_type} with data: {data}")
+        if schema.rate_limited:
+            error = await self._rate_limit_check(message_type)
+            if error:
+                if schema.close_on_limit:
+                    await self.send_error(error, close=True)
+                    raise ConnectionClosed(
+                        Close(code=status.WS_1008_POLICY_VIOLATION, reason="Message rate limit exceeded"),
+                        None
+                    )
+                await self.send_error(error, close=False)
+                return
+            self._message_timestamps.append(self._now())
+            if self.response_delay > 0:
+                await asyncio.sleep(self.response_delay)
+        # Echo back the message with the same type and content (matching real server)
+        response = {"type": message_type, "content": data.get("content", schema.default_content)}
+        if schema.echo_user_id:
+            response["user_id"] = data.get("user_id", self.user_id)
+        response["metadata"] = data.get("metadata", {})
+        if schema.timestamped:
+            response["timestamp"] = datetime.now(UTC).isoformat()
+        self.debug_log(f"[MockWebSocket] _echo echoing: {response}")
+        await self.send_queue.put(json.dumps(response, allow_nan=False))
+
     async def _handle_chat_message(self, data: Dict[str, Any]) -> None:
         self.debug_log(f"[MockWebSocket] _handle_chat_message called with data: {data}")
         # Rate limit check
@@ -472,7 +621,7 @@ class MockWebSocket:
             return
         # Only echo if this is the original message (no '_echoed' marker)
         if not data.get("_echoed", False):
-            now = asyncio.get_event_loop().time()
+            now = self._now()
             self._message_timestamps.append(now)
             if self.response_delay > 0:
                 await asyncio.sleep(self.response_delay)
@@ -488,82 +637,46 @@ class MockWebSocket:
         else:
             self.debug_log(f"[MockWebSocket] _handle_chat_message skipping echo to prevent recursion: {data}")
 
-    async def _handle_chat(self, data: Dict[str, Any]) -> None:
-        self.debug_log(f"[MockWebSocket] _handle_chat called with data: {data}")
-        # Rate limit check
-        error = await self._rate_limit_check("chat")
-        if error:
-            await self.send_error(error, close=False)
-            return
-        now = asyncio.get_event_loop().time()
-        self._message_timestamps.append(now)
-        if self.response_delay > 0:
-            await asyncio.sleep(self.response_delay)
-        # Echo back the message with the same type and content (matching real server)
-        response = {
-            "type": "chat",
-            "content": data.get("content", ""),
-            "user_id": data.get("user_id", self.user_id),
-            "timestamp": datetime.now(UTC).isoformat(),
-            "metadata": data.get("metadata", {})
-        }
-        self.debug_log(f"[MockWebSocket] _handle_chat echoing: {response}")
-        await self.send_queue.put(json.dumps(response, allow_nan=False))
-
-    async def _handle_typing(self, data: Dict[str, Any]) -> None:
-        """Handle typing indicator message.
-
-        Args:
-            data: Typing indicator message data
-        """
-        # Echo back the typing indicator with the same content
-        response = {
-            "type": "typing",
-            "content": data.get("content", "true"),
-            "metadata": data.get("metadata", {})
-        }
-        self.debug_log(f"[MockWebSocket] _handle_typing echoing: {response}")
-        await self.send_queue.put(json.dumps(response, allow_nan=False))
-
     async def _handle_stream_start(self, data: Dict[str, Any]) -> None:
         self.debug_log(f"[MockWebSocket] _handle_stream_start called with data: {data}")
         content = data.get("content", "")
-        async with self._stream_lock:
-            # Use consolidated rate limiting
-            error = self._check_rate_limit(self._stream_timestamps, self.max_streams_per_minute, self.max_streams_per_minute)
-            if error:
-                self.debug_log("[MockWebSocket] Rate limit exceeded for stream_start")
-                await self.send_error(error, close=False)
-                return
-            if not content:
-                self.debug_log("[MockWebSocket] _handle_stream_start: sending error 'Empty stream content'")
-                await self.send_error("Empty stream content")
-                return
+        # Decide synchronously so concurrent stream_start calls cannot interleave
+        # between the check and claiming the stream; no lock is needed.
+        error = self._check_rate_limit(self._stream_timestamps, self.max_streams_per_minute, self.max_streams_per_minute)
+        if error:
+            self.debug_log("[MockWebSocket] Rate limit exceeded for stream_start")
+            await self.send_error(error, close=False)
+            return
+        if not content:
+            self.debug_log("[MockWebSocket] _handle_stream_start: sending error 'Empty stream content'")
+            await self.send_error("Empty stream content")
+            return
+        if self._current_stream is not None:
+            self.debug_log("[MockWebSocket] _handle_stream_start: sending error 'Active stream already in progress'")
+            # Do not close the connection for concurrent stream error
+            await self.send_error("Active stream already in progress", close=False)
+            return
 
-            if self._current_stream is not None:
-                self.debug_log("[MockWebSocket] _handle_stream_start: sending error 'Active stream already in progress'")
-                # Do not close the connection for concurrent stream error
-                await self.send_error("Active stream already in progress", close=False)
-                return
+        # Claim the stream before the first await
+        self._current_stream = MockStreamResponse(content)
 
-            # Append timestamp for rate limiting
-            now = asyncio.get_event_loop().time()
-            self._stream_timestamps.append(now)
+        # Append timestamp for rate limiting
+        now = self._now()
+        self._stream_timestamps.append(now)
 
-            # Store the metadata for stream interruption logic
-            self._last_stream_start_metadata = data.get("metadata", {})
+        # Store the metadata for stream interruption logic
+        self._last_stream_start_metadata = data.get("metadata", {})
 
-            # Send stream start acknowledgment to receive queue (messages from server to client)
-            await self.receive_queue.put(json.dumps({
-                "type": "stream_start",
-                "content": "",
-                "metadata": data.get("metadata", {})
-            }, allow_nan=False))
-            self._stream_start_event.set()
+        # Send stream start acknowledgment to receive queue (messages from server to client)
+        await self.receive_queue.put(json.dumps({
+            "type": "stream_start",
+            "content": "",
+            "metadata": data.get("metadata", {})
+        }, allow_nan=False))
+        self._stream_start_event.set()
 
-            # Start streaming in background
-            self._current_stream = MockStreamResponse(content)
-            asyncio.create_task(self._process_stream())
+        # Start streaming in background
+        asyncio.create_task(self._process_stream())
 
     async def _handle_stream(self, data: Dict[str, Any]) -> None:
         """Handle stream message."""
@@ -598,8 +711,8 @@ class MockWebSocket:
                     self.debug_log("[MockWebSocket] Client disconnected during stream.")
                     normal_completion = False
                     break
-                await self.send_queue.put(json.dumps(message, allow_nan=False))
-                await asyncio.sleep(0.05)
+                # MockStreamResponse already paces chunks; don't yield a second time here
+                self.send_queue.put_nowait(json.dumps(message, allow_nan=False))
         except Exception as e:
             self.debug_log(f"[MockWebSocket] Error during stream: {e}")
             normal_completion = False
@@ -624,44 +737,4 @@ class MockWebSocket:
     def set_disconnected(self, context: str = ""):
         prev_state = self.client_state
         self.set_client_state(WebSocketState.DISCONNECTED, context=context)
-        self.debug_log(f"[MockWebSocket] set_disconnected called for client_id={self.client_id}, id={id(self)}, prev_state={prev_state}, new_state={self.client_state}, context={context}") 
-
-    async def _handle_system(self, data: Dict[str, Any]) -> None:
-        self.debug_log(f"[MockWebSocket] _handle_system called with data: {data}")
-        response = {
-            "type": "system",
-            "content": data.get("content", ""),
-            "metadata": data.get("metadata", {}),
-            "timestamp": datetime.now(UTC).isoformat()
-        }
-        self.debug_log(f"[MockWebSocket] _handle_system echoing: {response}")
-        await self.send_queue.put(json.dumps(response, allow_nan=False))
-
-    async def _handle_pong(self, data: Dict[str, Any]) -> None:
-        self.debug_log(f"[MockWebSocket] _handle_pong called with data: {data}")
-        # No-op: just ignore pong messages 
-
-    async def _handle_test_message(self, data: Dict[str, Any]) -> None:
-        self.debug_log(f"[MockWebSocket] _handle_test_message called with data: {data}")
-        # Rate limit check
-        error = await self._rate_limit_check("test")
-        if error:
-            await self.send_error(error, close=True)
-            raise ConnectionClosed(
-                Close(code=status.WS_1008_POLICY_VIOLATION, reason="Message rate limit exceeded"),
-                None
-            )
-        now = asyncio.get_event_loop().time()
-        self._message_timestamps.append(now)
-        if self.response_delay > 0:
-            await asyncio.sleep(self.response_delay)
-        # Echo back the message with the same type and content
-        response = {
-            "type": "test",
-            "content": data.get("content", ""),
-            "user_id": data.get("user_id", self.user_id),
-            "timestamp": datetime.now(UTC).isoformat(),
-            "metadata": data.get("metadata", {})
-        }
-        self.debug_log(f"[MockWebSocket] _handle_test_message echoing: {response}")
-        await self.send_queue.put(json.dumps(response, allow_nan=False)) 
\ No newline at end of file
+        self.debug_log(f"[MockWebSocket] set_disconnected called for client_id={self.client_id}, id={id(self)}, prev_state={prev_state}, new_state={self.client_state}, context={context}")
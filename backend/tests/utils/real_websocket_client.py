@@ -1,8 +1,48 @@
 import asyncio
 import json
-from websockets import connect, ConnectionClosed
+import logging
 from starlette.websockets import WebSocketState
 import os
+from types import MappingProxyType
+
+try:
+    import orjson
+
+    def _dumps(data) -> str:
+        # The server reads text frames, so hand websockets a str rather than bytes
+        return orjson.dumps(data).decode()
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib
+    # One shared encoder/decoder instead of json.dumps/loads resolving their defaults per message
+    _dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+    _loads = json.JSONDecoder().decode
+
+logger = logging.getLogger(__name__)
+
+def _read_mock_mode():
+    return os.environ.get("USE_MOCK_WEBSOCKET", "0").lower() in ("1", "true", "yes")
+
+_MOCK_MODE = _read_mock_mode()
+
+def _refresh_mock_mode():
+    """Re-read USE_MOCK_WEBSOCKET, for tests that toggle it after import."""
+    global _MOCK_MODE
+    _MOCK_MODE = _read_mock_mode()
+    return _MOCK_MODE
+
+def _connect_setting(name):
+    """Property for an attribute the connect arguments are built from; setting it drops the cache."""
+    attr = '_' + name
+
+    def fget(self):
+        return getattr(self, attr)
+
+    def fset(self, value):
+        setattr(self, attr, value)
+        self._connect_args = None
+
+    return property(fget, fset)
 
 class RealWebSocketClient:
     """
@@ -10,17 +50,46 @@ class RealWebSocketClient:
     Connects to a real WebSocket server, sends/receives JSON, and tracks connection state.
     Supports custom headers for external APIs.
     """
-    def __init__(self, uri, token=None, debug=False, headers=None, ws_token_query=False):
+    def __init__(self, uri, token=None, debug=False, headers=None, ws_token_query=False, compression=None):
         # Fast-fail if running in mock mode
-        if os.environ.get("USE_MOCK_WEBSOCKET", "0").lower() in ("1", "true", "yes"):
+        if _MOCK_MODE:
             raise RuntimeError("RealWebSocketClient should not be used in mock mode (USE_MOCK_WEBSOCKET=1)")
+        self._connect_args = None  # (uri, kwargs) for connect(), built on first use
         self.uri = uri
-        self.token = token
-        self.headers = headers or {}
+        self.headers = headers
         self.websocket = None
-        self.client_state = WebSocketState.CONNECTING
-        self.debug = debug
+        self._connected = False
+        self.debug = debug  # Kept for callers; verbosity now follows LOG_LEVEL via the module logger
         self.ws_token_query = ws_token_query  # If True, send token as query param
+        # permessage-deflate only costs CPU for small localhost frames; pass "deflate" to opt in
+        self.compression = compression
+        self.token = token
+
+    uri = _connect_setting('uri')
+    token = _connect_setting('token')  # Tests swap tokens between connect() calls
+    ws_token_query = _connect_setting('ws_token_query')
+    compression = _connect_setting('compression')
+
+    @property
+    def headers(self):
+        """Extra handshake headers, read-only; assign a new mapping to change them."""
+        return self._headers
+
+    @headers.setter
+    def headers(self, value):
+        self._headers = MappingProxyType(dict(value or {}))
+        self._connect_args = None
+
+    @property
+    def client_state(self):
+        """Starlette-style state derived from the connected flag."""
+        if self._connected:
+            return WebSocketState.CONNECTED
+        return WebSocketState.CONNECTING if self.websocket is None else WebSocketState.DISCONNECTED
+
+    @client_state.setter
+    def client_state(self, state):
+        self._connected = state == WebSocketState.CONNECTED
 
     async def __aenter__(self):
         await self.connect()
@@ -29,38 +98,77 @@ class RealWebSocketClient:
     async def __aexit__(self, exc_type, exc, tb):
         await self.close()
 
-    async def connect(self):
-        connect_kwargs = {}
-        uri = self.uri
+    def _build_uri(self):
         if self.ws_token_query and self.token:
             # Append token as query parameter
-            sep = '&' if '?' in uri else '?'
-            uri = f"{uri}{sep}token={self.token}"
-        elif self.token and 'Authorization' not in self.headers:
+            sep = '&' if '?' in self.uri else '?'
+            return f"{self.uri}{sep}token={self.token}"
+        return self.uri
+
+    def _build_connect_kwargs(self):
+        connect_kwargs = {'compression': self.compression}
+        if not self.ws_token_query and self.token and 'Authorization' not in self.headers:
             # Add token as Bearer if not already present
-            connect_kwargs.setdefault('extra_headers', {})['Authorization'] = f'Bearer {self.token}'
+            connect_kwargs['extra_headers'] = {'Authorization': f'Bearer {self.token}'}
         if self.headers:
             connect_kwargs['extra_headers'] = {**connect_kwargs.get('extra_headers', {}), **self.headers}
-        if self.debug:
-            print(f"[RealWebSocketClient] Connecting to {uri} with headers: {connect_kwargs.get('extra_headers')}")
-        self.websocket = await connect(uri, **connect_kwargs)
-        self.client_state = WebSocketState.CONNECTED
+        return connect_kwargs
+
+    def _connect_arguments(self):
+        """Return the cached (uri, kwargs) for connect(), rebuilding them after a setting changed."""
+        if self._connect_args is None:
+            self._connect_args = (self._build_uri(), self._build_connect_kwargs())
+        return self._connect_args
+
+    async def connect(self):
+        final_uri, connect_kwargs = self._connect_arguments()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Connecting to %s with headers: %s", final_uri, connect_kwargs.get('extra_headers'))
+        # Imported here so collecting tests that never open a real socket skips websockets
+        from websockets import connect
+        self.websocket = await connect(final_uri, **connect_kwargs)
+        self._connected = True
 
     async def send_json(self, data):
-        if self.debug:
-            print(f"[RealWebSocketClient] Sending: {data}")
-        await self.websocket.send(json.dumps(data))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending: %s", data)
+        await self.websocket.send(_dumps(data))
+
+    async def send_many(self, items):
+        """Send several JSON messages back-to-back, serializing them all up front."""
+        payloads = [_dumps(item) for item in items]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending %d messages", len(payloads))
+        send = self.websocket.send
+        for payload in payloads:
+            await send(payload)
 
     async def receive_json(self):
         msg = await self.websocket.recv()
-        if self.debug:
-            print(f"[RealWebSocketClient] Received: {msg}")
-        return json.loads(msg)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received: %s", msg)
+        return _loads(msg)
+
+    async def reset(self, drain_timeout=0.01):
+        """Prepare a shared client for reuse: reconnect if closed, otherwise drop pending frames."""
+        if not self.is_connected():
+            await self.connect()
+            return
+        from websockets.exceptions import ConnectionClosed
+        try:
+            while True:
+                await asyncio.wait_for(self.websocket.recv(), drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except ConnectionClosed:
+            # The server closed the socket since the last test
+            self._connected = False
+            await self.connect()
 
     async def close(self):
-        if self.websocket and self.client_state == WebSocketState.CONNECTED:
+        if self.websocket and self._connected:
             await self.websocket.close()
-            self.client_state = WebSocketState.DISCONNECTED
+            self._connected = False
 
     def is_connected(self):
-        return self.client_state == WebSocketState.CONNECTED 
\ No newline at end of file
+        return self._connected 
\ No newline at end of file
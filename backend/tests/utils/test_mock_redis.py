@@ -1,27 +1,66 @@
 """Tests for the Redis mock implementation."""
 import pytest
 import asyncio
-from typing import Dict, Any
 from redis.exceptions import WatchError, RedisError
 from tests.utils.mock_redis import MockRedis
-import sys
 
-@pytest.fixture
-async def mock_redis():
-    """Create a fresh MockRedis instance for each test."""
+@pytest.fixture(scope="session")
+def _mock_redis_singleton():
+    """Single MockRedis shared by every test in the session."""
     return MockRedis()
 
-@pytest.mark.asyncio
-async def test_set_get(mock_redis):
+@pytest.fixture
+def mock_redis(_mock_redis_singleton):
+    """Provide the shared MockRedis instance, reset to an empty state.
+
+    reset() clears data, expiries, pub/sub and error mode; tests must not
+    change anything else on the instance.
+    """
+    _mock_redis_singleton.reset()
+    return _mock_redis_singleton
+
+class _FakeClock:
+    """Manually advanced replacement for MockRedis._now."""
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(mock_redis, monkeypatch):
+    """Drive MockRedis expiry from a fake clock instead of wall-clock time."""
+    fake = _FakeClock()
+    monkeypatch.setattr(mock_redis, "_now", fake)
+    return fake
+
+@pytest.mark.parametrize(
+    "value",
+    [b"test_value", b"\x00\xff", b"long" * 1024],
+    ids=["plain", "binary", "large"],
+)
+def test_set_get(mock_redis, value):
     """Test basic set/get operations."""
     key = b"test_key"
+    assert mock_redis.sync.set(key, value) is True
+    assert mock_redis.sync.get(key) == value
+
+@pytest.mark.asyncio
+async def test_set_get_with_expiry(mock_redis, clock):
+    """Test set/get with expiry."""
+    key = b"test_key"
     value = b"test_value"
-    assert await mock_redis.set(key, value) is True
+    assert await mock_redis.set(key, value, ex=1) is True
     assert await mock_redis.get(key) == value
+    clock.advance(1.1)
+    assert await mock_redis.get(key) is None
 
 @pytest.mark.asyncio
-async def test_set_get_with_expiry(mock_redis):
-    """Test set/get with expiry."""
+async def test_set_get_with_real_expiry(mock_redis):
+    """Test set/get with expiry against the real clock."""
     key = b"test_key"
     value = b"test_value"
     assert await mock_redis.set(key, value, ex=1) is True
@@ -29,83 +68,78 @@ async def test_set_get_with_expiry(mock_redis):
     await asyncio.sleep(1.1)
     assert await mock_redis.get(key) is None
 
-@pytest.mark.asyncio
-async def test_hset_hget(mock_redis):
+def test_hset_hget(mock_redis):
     """Test hash operations."""
     key = b"test_hash"
     field = b"test_field"
     value = b"test_value"
-    assert await mock_redis.hset(key, field, value) == 1
-    assert await mock_redis.hget(key, field) == value
+    assert mock_redis.sync.hset(key, field, value) == 1
+    assert mock_redis.sync.hget(key, field) == value
 
-@pytest.mark.asyncio
-async def test_hgetall(mock_redis):
+def test_hgetall(mock_redis):
     """Test getting all hash fields."""
     key = b"test_hash"
     data = {b"field1": b"value1", b"field2": b"value2"}
     for field, value in data.items():
-        await mock_redis.hset(key, field, value)
-    assert await mock_redis.hgetall(key) == data
+        mock_redis.sync.hset(key, field, value)
+    assert mock_redis.sync.hgetall(key) == data
 
-@pytest.mark.asyncio
-async def test_delete(mock_redis):
+def test_delete(mock_redis):
     """Test key deletion."""
     key = b"test_key"
     value = b"test_value"
-    await mock_redis.set(key, value)
-    assert await mock_redis.delete(key) == 1
-    assert await mock_redis.get(key) is None
+    mock_redis.sync.set(key, value)
+    assert mock_redis.sync.delete(key) == 1
+    assert mock_redis.sync.get(key) is None
 
-@pytest.mark.asyncio
-async def test_exists(mock_redis):
+def test_exists(mock_redis):
     """Test key existence check."""
     key = b"test_key"
     value = b"test_value"
-    assert await mock_redis.exists(key) == 0
-    await mock_redis.set(key, value)
-    assert await mock_redis.exists(key) == 1
-
-@pytest.mark.asyncio
-async def test_lpush_lpop(mock_redis):
-    """Test list operations."""
-    key = b"test_list"
-    value1 = b"value1"
-    value2 = b"value2"
-    assert await mock_redis.lpush(key, value1, value2) == 2
-    assert await mock_redis.lpop(key) == value2
-    assert await mock_redis.lpop(key) == value1
-    assert await mock_redis.lpop(key) is None
+    assert mock_redis.sync.exists(key) == 0
+    mock_redis.sync.set(key, value)
+    assert mock_redis.sync.exists(key) == 1
 
-@pytest.mark.asyncio
-async def test_rpush_rpop(mock_redis):
-    """Test list operations from right side."""
+@pytest.mark.parametrize("pusher,popper", [("lpush", "lpop"), ("rpush", "rpop")])
+def test_push_pop(mock_redis, pusher, popper):
+    """Test list push/pop from either side."""
     key = b"test_list"
     value1 = b"value1"
     value2 = b"value2"
-    assert await mock_redis.rpush(key, value1, value2) == 2
-    assert await mock_redis.rpop(key) == value2
-    assert await mock_redis.rpop(key) == value1
-    assert await mock_redis.rpop(key) is None
+    push = getattr(mock_redis.sync, pusher)
+    pop = getattr(mock_redis.sync, popper)
+    assert push(key, value1, value2) == 2
+    assert pop(key) == value2
+    assert pop(key) == value1
+    assert pop(key) is None
 
-@pytest.mark.asyncio
-async def test_lrange(mock_redis):
+def test_lrange(mock_redis):
     """Test list range retrieval."""
     key = b"test_list"
     values = [b"value1", b"value2", b"value3"]
-    await mock_redis.rpush(key, *values)
-    assert await mock_redis.lrange(key, 0, -1) == values
-    assert await mock_redis.lrange(key, 0, 1) == values[:2]
-    assert await mock_redis.lrange(key, -2, -1) == values[-2:]
+    mock_redis.sync.rpush(key, *values)
+    assert mock_redis.sync.lrange(key, 0, -1) == values
+    assert mock_redis.sync.lrange(key, 0, 1) == values[:2]
+    assert mock_redis.sync.lrange(key, -2, -1) == values[-2:]
+
+async def _start_transaction(redis, watch_api, key):
+    """Open a transaction watching key via either supported calling convention."""
+    if watch_api == "await_watch":
+        return await redis.watch(key)
+    pipe = redis.pipeline()
+    pipe.watch(key)
+    await pipe.multi()
+    return pipe
 
 @pytest.mark.asyncio
-async def test_watch_multi_exec(mock_redis):
+@pytest.mark.parametrize("watch_api", ["await_watch", "pipeline"])
+async def test_watch_multi_exec(mock_redis, watch_api):
     """Test transaction handling."""
     key = b"test_key"
     value1 = b"value1"
-    value2 = b"value2"
     
     # Start transaction with watch
-    tr = await mock_redis.watch(key)
+    tr = await _start_transaction(mock_redis, watch_api, key)
     # Queue commands on transaction object
     await tr.set(key, value1)
     await tr.get(key)
@@ -116,14 +150,15 @@ async def test_watch_multi_exec(mock_redis):
     assert await mock_redis.get(key) == value1
 
 @pytest.mark.asyncio
-async def test_watch_multi_exec_conflict(mock_redis):
+@pytest.mark.parametrize("watch_api", ["await_watch", "pipeline"])
+async def test_watch_multi_exec_conflict(mock_redis, watch_api):
     """Test transaction conflict handling."""
     key = b"test_key"
     value1 = b"value1"
     value2 = b"value2"
     
     # Start transaction with watch
-    tr = await mock_redis.watch(key)
+    tr = await _start_transaction(mock_redis, watch_api, key)
     # Simulate concurrent modification outside transaction
     await mock_redis.set(key, value2)
     # Queue commands on transaction object
@@ -183,17 +218,17 @@ async def test_pubsub_basic(mock_redis):
     num_subs = await mock_redis.publish(channel, message)
     assert num_subs == 1
 
-    # Receive the message
-    received = await queue.get()
-    assert received == message
+    # publish() enqueues synchronously, so the message is already there
+    assert queue.get_nowait() == message
 
     # Unsubscribe and ensure no more messages are received
     await mock_redis.unsubscribe(channel, queue)
     num_subs = await mock_redis.publish(channel, "should not be received")
     assert num_subs == 0
+    assert queue.empty()
 
 @pytest.mark.asyncio
-async def test_ttl_pttl(mock_redis):
+async def test_ttl_pttl(mock_redis, clock):
     """Test ttl and pttl methods for expiry semantics."""
     key = b"ttl_key"
     value = b"value"
@@ -215,7 +250,7 @@ async def test_ttl_pttl(mock_redis):
     assert 0 < pttl <= 2000
 
     # After expiry
-    await asyncio.sleep(2.1)
+    clock.advance(2.1)
     assert await mock_redis.ttl(key) == -2
     assert await mock_redis.pttl(key) == -2
 
@@ -0,0 +1,65 @@
+"""Tests for server-to-client traffic on the MockWebSocket."""
+import pytest
+
+from tests.utils.mock_websocket import MockWebSocket
+
+@pytest.fixture
+async def connected_ws():
+    """A MockWebSocket that has been accepted."""
+    ws = MockWebSocket(client_id="client-1", user_id="user-1")
+    await ws.accept()
+    yield ws
+    await ws.close()
+
+async def test_send_json_is_push_only(connected_ws):
+    """A server push is queued as-is and runs no handler."""
+    await connected_ws.send_json({"type": "chat_message", "content": "hi"})
+
+    assert await connected_ws.receive_json() == {"type": "chat_message", "content": "hi"}
+    assert connected_ws.send_queue.empty()
+
+async def test_server_ping_is_answered_with_pong(connected_ws):
+    """A heartbeat ping gets the pong the manager waits for on receive_json."""
+    await connected_ws.send_json({"type": "ping", "timestamp": "2024-01-01T00:00:00+00:00"})
+
+    assert (await connected_ws.receive_json())["type"] == "pong"
+    assert connected_ws.send_queue.empty()
+
+async def test_server_ping_is_queued_without_auto_pong(connected_ws):
+    """With auto-pong off the ping is delivered and left unanswered."""
+    connected_ws.set_auto_pong(False)
+    await connected_ws.send_json({"type": "ping", "timestamp": "2024-01-01T00:00:00+00:00"})
+
+    assert (await connected_ws.receive_json())["type"] == "ping"
+
+async def test_reset_restores_a_used_mock(connected_ws):
+    """A reset mock matches a new one, with its queues and events reused."""
+    send_queue = connected_ws.send_queue
+    await connected_ws.send_json({"type": "chat_message", "content": "left over"})
+    connected_ws.response_delay = 1.0
+    connected_ws.max_messages_per_second = 1
+    connected_ws.set_auto_pong(False)
+    await connected_ws.close(code=1011, reason="boom")
+
+    connected_ws.reset("client-2", "user-2", ip_address="10.0.0.2", query_params={"token": "t"})
+    fresh = MockWebSocket("client-2", "user-2", ip_address="10.0.0.2", query_params={"token": "t"})
+
+    assert connected_ws.send_queue is send_queue
+    assert connected_ws.send_queue.empty()
+    assert not connected_ws._closed_event.is_set()
+    for name in MockWebSocket.__slots__:
+        if name in ("send_queue", "receive_queue", "_client", "_message_handlers",
+                    "_stream_start_event", "_closed_event", "_state_changed"):
+            continue
+        assert getattr(connected_ws, name) == getattr(fresh, name), name
+    assert connected_ws.client.host == "10.0.0.2"
+
+async def test_reset_mock_can_be_accepted_again(connected_ws):
+    """After reset the mock goes through accept() like a new connection."""
+    await connected_ws.close()
+    connected_ws.reset("client-2", "user-2")
+
+    await connected_ws.accept()
+    await connected_ws.inject_client_message({"type": "ping"})
+
+    assert (await connected_ws.receive_json())["type"] == "pong"
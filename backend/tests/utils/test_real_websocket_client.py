@@ -0,0 +1,102 @@
+"""Tests for reusing a pooled RealWebSocketClient without a live server."""
+import asyncio
+
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.frames import Close
+
+from tests.utils.real_websocket_client import RealWebSocketClient
+
+class _FakeConnection:
+    """Stands in for a websockets connection: yields queued frames, then idles or closes."""
+    def __init__(self, frames, closed=False):
+        self.frames = list(frames)
+        self.closed_by_server = closed
+
+    async def recv(self):
+        if self.frames:
+            return self.frames.pop(0)
+        if self.closed_by_server:
+            raise ConnectionClosed(Close(code=1000, reason="bye"), None)
+        await asyncio.Event().wait()
+
+@pytest.fixture
+def pooled_client(monkeypatch):
+    """A client marked connected to a fake socket; connect() only counts calls."""
+    client = RealWebSocketClient(uri="ws://test/ws", token="token")
+    client.connects = 0
+
+    async def fake_connect():
+        client.connects += 1
+        client.websocket = _FakeConnection([])
+        client._connected = True
+
+    monkeypatch.setattr(client, "connect", fake_connect)
+    return client
+
+async def test_reset_drains_connected_client(pooled_client):
+    """Resetting a live pooled client drops leftover frames and keeps the socket."""
+    socket = pooled_client.websocket = _FakeConnection(['{"type": "pong"}', '{"type": "chat"}'])
+    pooled_client._connected = True
+
+    await pooled_client.reset()
+
+    assert socket.frames == []
+    assert pooled_client.websocket is socket
+    assert pooled_client.connects == 0
+
+async def test_reset_reconnects_when_server_closed(pooled_client):
+    """A socket the server closed between tests is replaced on reset."""
+    socket = pooled_client.websocket = _FakeConnection(['{"type": "pong"}'], closed=True)
+    pooled_client._connected = True
+
+    await pooled_client.reset()
+
+    assert pooled_client.connects == 1
+    assert pooled_client.websocket is not socket
+    assert pooled_client.is_connected()
+
+async def test_reset_connects_unconnected_client(pooled_client):
+    """A client that never connected is connected by reset."""
+    await pooled_client.reset()
+
+    assert pooled_client.connects == 1
+
+def test_connect_arguments_are_cached():
+    """The URI and kwargs are built once and reused across connect() calls."""
+    client = RealWebSocketClient(uri="ws://test/ws", token="token")
+
+    assert client._connect_arguments() is client._connect_arguments()
+
+@pytest.mark.parametrize("name, value, expected_uri, expected_headers", [
+    ("token", "other", "ws://test/ws", {"Authorization": "Bearer other"}),
+    ("headers", {"X-Test": "1"}, "ws://test/ws", {"Authorization": "Bearer token", "X-Test": "1"}),
+    ("ws_token_query", True, "ws://test/ws?token=token", None),
+    ("uri", "ws://other/ws", "ws://other/ws", {"Authorization": "Bearer token"}),
+])
+def test_connect_arguments_follow_setting_changes(name, value, expected_uri, expected_headers):
+    """Changing any setting the arguments depend on rebuilds them."""
+    client = RealWebSocketClient(uri="ws://test/ws", token="token")
+    client._connect_arguments()
+
+    setattr(client, name, value)
+    uri, kwargs = client._connect_arguments()
+
+    assert uri == expected_uri
+    assert kwargs.get("extra_headers") == expected_headers
+
+def test_connect_arguments_follow_compression():
+    """Turning compression on after construction reaches the connect kwargs."""
+    client = RealWebSocketClient(uri="ws://test/ws")
+    client._connect_arguments()
+
+    client.compression = "deflate"
+
+    assert client._connect_arguments()[1]["compression"] == "deflate"
+
+def test_headers_are_read_only():
+    """In-place edits would bypass the cache, so the mapping rejects them."""
+    client = RealWebSocketClient(uri="ws://test/ws", headers={"X-Test": "1"})
+
+    with pytest.raises(TypeError):
+        client.headers["X-Test"] = "2"
@@ -2,9 +2,14 @@
 Sync-only tests for the SyncMockRedis and SyncMockPipeline.
 These tests should be run in a synchronous context (e.g., with pytest, not pytest-asyncio).
 """
+import importlib.util
+
 import pytest
 from tests.utils.mock_redis import SyncMockRedis
 
+# pytest-benchmark is optional; without it only the benchmark test is skipped
+_HAS_BENCHMARK = importlib.util.find_spec("pytest_benchmark") is not None
+
 def test_pipeline_basic():
     """Test basic pipeline batching and result order (sync mock only)."""
     pipe = SyncMockRedis().pipeline()
@@ -17,4 +22,22 @@ def test_pipeline_basic():
     # Confirm state
     redis = pipe.redis
     assert redis.get(b"pkey1") == b"v1"
-    assert redis.get(b"pkey2") is None 
\ No newline at end of file
+    assert redis.get(b"pkey2") is None
+
+@pytest.mark.skipif(not _HAS_BENCHMARK, reason="requires pytest-benchmark")
+@pytest.mark.parametrize("n_ops", [10, 100, 1000])
+def test_pipeline_throughput(request, benchmark, n_ops):
+    """Benchmark n_ops-command pipelines; only runs under --benchmark-only."""
+    if not request.config.getoption("benchmark_only"):
+        pytest.skip("benchmark: run with --benchmark-only")
+    redis = SyncMockRedis()
+    keys = [f"k{i}".encode() for i in range(n_ops)]
+
+    def run():
+        pipe = redis.pipeline()
+        for key in keys:
+            pipe.set(key, b"v")
+        return pipe.execute()
+
+    results = benchmark(run)
+    assert len(results) == n_ops
@@ -1,12 +1,35 @@
 import pytest
+import pytest_asyncio
 import os
+from typing import Dict, Tuple
 from tests.utils.real_websocket_client import RealWebSocketClient
 
-@pytest.fixture
-async def real_websocket_client(request):
+# Connected clients shared across the session, keyed on (uri, token)
+_client_pool: Dict[Tuple[str, str], RealWebSocketClient] = {}
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def real_websocket_pool():
+    """
+    Session-wide pool of RealWebSocketClients so each (uri, token) pair pays the
+    WebSocket handshake once instead of once per test. Closes every client at the
+    end of the session.
+    """
+    try:
+        yield _client_pool
+    finally:
+        for client in list(_client_pool.values()):
+            await client.close()
+        _client_pool.clear()
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def real_websocket_client(request, real_websocket_pool):
     """
     Provides a connected RealWebSocketClient for integration tests.
     Only runs for tests marked with @pytest.mark.real_websocket.
+
+    The client is shared across tests and reset (pending frames dropped,
+    reconnected if closed) before each use. Tests using it must run on the
+    session loop: @pytest.mark.asyncio(loop_scope="session").
     """
     if not request.node.get_closest_marker("real_websocket"):
         pytest.skip("Test requires @pytest.mark.real_websocket")
@@ -16,5 +39,9 @@ async def real_websocket_client(request):
     debug = bool(os.getenv("WS_CLIENT_DEBUG", False))
     print(f"[DEBUG][real_websocket_client] Using URI: {uri}")
     print(f"[DEBUG][real_websocket_client] Using TOKEN: {token}")
-    async with RealWebSocketClient(uri=uri, token=token, debug=debug) as client:
-        yield client 
\ No newline at end of file
+    key = (uri, token)
+    client = real_websocket_pool.get(key)
+    if client is None:
+        client = real_websocket_pool[key] = RealWebSocketClient(uri=uri, token=token, debug=debug)
+    await client.reset()
+    yield client
@@ -1,13 +1,12 @@
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from collections import defaultdict, deque
+from contextlib import aclosing
+from typing import Dict, Any, Optional, List, Tuple, Union, DefaultDict, Deque, AsyncIterator
 from websockets.exceptions import ConnectionClosed
 from websockets.frames import Close
-from datetime import datetime, UTC
 from fastapi import status
 from starlette.websockets import WebSocketState
-import uuid
-import copy
 import os
 
 from app.core.websocket import WebSocketManager
@@ -17,8 +16,26 @@ from tests.utils.real_websocket_client import RealWebSocketClient
 
 logger = logging.getLogger(__name__)
 
+# The helper's print() tracing is off unless WSHELPER_DEBUG=1
+_DEBUG = os.environ.get("WSHELPER_DEBUG") == "1"
+
+# Read once at import: pytest-env sets ENVIRONMENT from pytest.ini; the
+# TEST_WS_URI / TEST_USER_TOKEN overrides must be exported before pytest starts
+_ENV_IS_TEST = os.environ.get("ENVIRONMENT") == "test"
+_TEST_WS_URI = os.getenv("TEST_WS_URI", "ws://backend-test:8000/ws")
+_TEST_USER_TOKEN = os.getenv("TEST_USER_TOKEN")
+
+_POLICY_CODE = status.WS_1008_POLICY_VIOLATION
+
+def _policy_close(reason: str) -> ConnectionClosed:
+    """Build the ConnectionClosed raised when the server answers with an error message."""
+    return ConnectionClosed(Close(code=_POLICY_CODE, reason=reason), None)
+
 class WebSocketTestHelper:
     """Helper class for WebSocket testing."""
+
+    # Shared by every tokenless MockWebSocket; treated as read-only
+    _EMPTY_PARAMS: Dict[str, str] = {}
     
     def __init__(
         self,
@@ -30,7 +47,8 @@ class WebSocketTestHelper:
         connect_timeout: float = 5.0,
         message_timeout: float = 5.0,
         mock_mode: bool = False,
-        ws_token_query: bool = False
+        ws_token_query: bool = False,
+        mock_pool: Optional[List[MockWebSocket]] = None
     ):
         """Initialize WebSocket test helper.
 
@@ -44,6 +62,8 @@ class WebSocketTestHelper:
             message_timeout: Message timeout in seconds
             mock_mode: Whether to use the mock WebSocket (default False)
             ws_token_query: Whether to send token as query param (default False)
+            mock_pool: Optional list of released MockWebSockets to reuse; cleanup()
+                returns the mocks this helper handed out to it
         """
         self.websocket_manager = websocket_manager
         self.rate_limiter = rate_limiter
@@ -54,9 +74,26 @@ class WebSocketTestHelper:
         self.message_timeout = message_timeout
         self.mock_mode = mock_mode
         self.ws_token_query = ws_token_query
-        print(f"[DEBUG][WebSocketTestHelper.__init__] mock_mode: {mock_mode} ws_token_query: {ws_token_query}")
+        self.mock_pool = mock_pool
+        # Mocks handed out since the last cleanup(), returned to mock_pool by it
+        self._checked_out: List[MockWebSocket] = []
+        if _DEBUG:
+            print(f"[DEBUG][WebSocketTestHelper.__init__] mock_mode: {mock_mode} ws_token_query: {ws_token_query}")
         self.active_connections: Dict[str, MockWebSocket] = {}
-        self.stream_messages: Dict[str, List[Dict[str, Any]]] = {}
+        # Messages wait_for_message read past, per client and then per type
+        self._typed_queues: Dict[str, DefaultDict[str, Deque[Dict[str, Any]]]] = defaultdict(lambda: defaultdict(deque))
+        # Set when the helper changes a client's state, for wait_for_state on non-mock sockets
+        self._state_events: Dict[str, asyncio.Event] = {}
+
+    def reset(self) -> None:
+        """Forget all tracked connections so the helper can be reused by another test.
+
+        Clears the tracking dicts in place; disconnect through cleanup() first if
+        the connections are still open.
+        """
+        self.active_connections.clear()
+        self._typed_queues.clear()
+        self._state_events.clear()
 
     async def connect_and_catch(
         self,
@@ -68,8 +105,9 @@ class WebSocketTestHelper:
         request=None
     ):
         """Create and connect a mock or real WebSocket, returning (ws, exc)."""
-        print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] called. Using class: {self.__class__.__name__}")
-        print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] self.mock_mode: {self.mock_mode}")
+        if _DEBUG:
+            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] called. Using class: {self.__class__.__name__}")
+            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] self.mock_mode: {self.mock_mode}")
         user_id = user_id or self.test_user_id
         auth_token = token or auth_token or self.auth_token
         timeout = connect_timeout or self.connect_timeout
@@ -79,46 +117,59 @@ class WebSocketTestHelper:
         if request is not None and hasattr(request, 'config') and hasattr(request.config, 'getoption'):
             ws_token_query = request.config.getoption('ws_token_query', False)
         if self.mock_mode:
-            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Instantiating MockWebSocket for client_id={client_id}")
-            ws = MockWebSocket(
-                client_id=client_id,
-                user_id=user_id,
-                ip_address=self.test_ip,
-                query_params={"token": auth_token} if auth_token else {}
-            )
-            logger.debug(f"[WebSocketTestHelper] After MockWebSocket __init__: client_id={client_id} state={ws.client_state}")
+            if _DEBUG:
+                print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Instantiating MockWebSocket for client_id={client_id}")
+            query_params = {"token": auth_token} if auth_token else self._EMPTY_PARAMS
+            if self.mock_pool:
+                ws = self.mock_pool.pop()
+                ws.reset(client_id, user_id, self.test_ip, query_params)
+            else:
+                ws = MockWebSocket(
+                    client_id=client_id,
+                    user_id=user_id,
+                    ip_address=self.test_ip,
+                    query_params=query_params
+                )
+            if self.mock_pool is not None:
+                self._checked_out.append(ws)
+            logger.debug("[WebSocketTestHelper] After MockWebSocket __init__: client_id=%s state=%s", client_id, ws.client_state)
             try:
-                print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] About to call websocket_manager.connect for client_id={client_id}")
+                if _DEBUG:
+                    print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] About to call websocket_manager.connect for client_id={client_id}")
                 async with asyncio.timeout(timeout):
                     await self.websocket_manager.connect(
                         client_id=client_id,
                         websocket=ws,
                         user_id=user_id
                     )
-                print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] After websocket_manager.connect for client_id={client_id}")
+                if _DEBUG:
+                    print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] After websocket_manager.connect for client_id={client_id}")
                 if not client_id:
                     raise RuntimeError("Connection succeeded with missing client ID")
                 self.add_connection(client_id, ws)
-                logger.debug(f"[WebSocketTestHelper] After websocket_manager.connect: client_id={client_id} state={ws.client_state}")
-                logger.debug(f"[WebSocketTestHelper] After add_connection: client_id={client_id} state={ws.client_state}")
+                logger.debug("[WebSocketTestHelper] After websocket_manager.connect: client_id=%s state=%s", client_id, ws.client_state)
+                logger.debug("[WebSocketTestHelper] After add_connection: client_id=%s state=%s", client_id, ws.client_state)
                 self.debug_active_connections()
-                if os.environ.get("ENVIRONMENT") == "test":
+                if _ENV_IS_TEST:
                     await self.send_message(client_id, {"type": "ping"})
                     pong = await self.receive_message(client_id)
-                    logger.debug(f"[WebSocketTestHelper] Received pong after connect: {pong}")
+                    logger.debug("[WebSocketTestHelper] Received pong after connect: %s", pong)
             except Exception as e:
                 exc = e
         else:
-            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Instantiating RealWebSocketClient for client_id={client_id}")
-            ws_uri = os.getenv("TEST_WS_URI", "ws://backend-test:8000/ws")
-            ws_token = auth_token or os.getenv("TEST_USER_TOKEN")
-            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Connecting to URL: {ws_uri}?token={ws_token}&client_id={client_id}")
+            if _DEBUG:
+                print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Instantiating RealWebSocketClient for client_id={client_id}")
+            ws_uri = _TEST_WS_URI
+            ws_token = auth_token or _TEST_USER_TOKEN
+            if _DEBUG:
+                print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] Connecting to URL: {ws_uri}?token={ws_token}&client_id={client_id}")
             ws = RealWebSocketClient(uri=ws_uri, token=ws_token, debug=True, ws_token_query=ws_token_query)
             try:
                 await ws.connect()
             except Exception as e:
                 exc = e
-        print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] ws instance type: {type(ws)} exc: {exc}")
+        if _DEBUG:
+            print(f"[DEBUG][WebSocketTestHelper.connect_and_catch] ws instance type: {type(ws)} exc: {exc}")
         return ws, exc
 
     async def connect(
@@ -146,21 +197,27 @@ class WebSocketTestHelper:
         Args:
             client_id: Client ID to disconnect
         """
-        logger.debug(f"[WebSocketTestHelper] disconnect called for client_id={client_id}")
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            logger.debug(f"[WebSocketTestHelper] disconnect: websocket id={id(websocket)} state={websocket.client_state}")
-            await self.websocket_manager.disconnect(client_id)
-            # Ensure the mock websocket state is set to DISCONNECTED
-            if hasattr(websocket, "client_state") and websocket.client_state != WebSocketState.DISCONNECTED:
-                websocket.client_state = WebSocketState.DISCONNECTED
-                logger.debug(f"[WebSocketTestHelper] Forced client_state DISCONNECTED for client_id={client_id}")
-            logger.debug(f"[WebSocketTestHelper] Removing client_id={client_id} from active_connections (final state: {websocket.client_state}, id={id(websocket)})")
-            self.remove_connection(client_id)
-            self.debug_active_connections()
-            if client_id in self.stream_messages:
-                del self.stream_messages[client_id]
-            await asyncio.sleep(0)  # Yield to event loop
+        logger.debug("[WebSocketTestHelper] disconnect called for client_id=%s", client_id)
+        # Untrack first so the helper stays consistent even if the manager raises
+        websocket = self.active_connections.pop(client_id, None)
+        if websocket is None:
+            return
+        self._typed_queues.pop(client_id, None)
+        state_event = self._state_events.pop(client_id, None)
+        logger.debug("[WebSocketTestHelper] disconnect: websocket id=%s state=%s", id(websocket), websocket.client_state)
+        await self.websocket_manager.disconnect(client_id)
+        # Ensure the mock websocket state is set to DISCONNECTED
+        if isinstance(websocket, MockWebSocket) and websocket.client_state != WebSocketState.DISCONNECTED:
+            websocket.set_client_state(WebSocketState.DISCONNECTED, context="helper_disconnect")
+        elif hasattr(websocket, "client_state") and websocket.client_state != WebSocketState.DISCONNECTED:
+            websocket.client_state = WebSocketState.DISCONNECTED
+            logger.debug("[WebSocketTestHelper] Forced client_state DISCONNECTED for client_id=%s", client_id)
+        if state_event is not None:
+            state_event.set()
+        self.debug_active_connections()
+        # Kept on purpose: the manager cancelled the client's heartbeat task, and
+        # one yield lets that cancellation land before the test carries on
+        await asyncio.sleep(0)
 
     async def send_json(
         self,
@@ -180,96 +237,164 @@ class WebSocketTestHelper:
         Returns:
             Response data
         """
-        print(f"[DEBUG][WebSocketTestHelper.send_json] called. Using class: {self.__class__.__name__}")
+        if _DEBUG:
+            print(f"[DEBUG][WebSocketTestHelper.send_json] called. Using class: {self.__class__.__name__}")
         ws = self.active_connections.get(client_id)
-        print(f"[DEBUG][WebSocketTestHelper.send_json] ws instance type: {type(ws)} for client_id={client_id}")
-        logger.debug(f"[WebSocketTestHelper] send_json: client_id={client_id} data={data}")
+        if _DEBUG:
+            print(f"[DEBUG][WebSocketTestHelper.send_json] ws instance type: {type(ws)} for client_id={client_id}")
+        logger.debug("[WebSocketTestHelper] send_json: client_id=%s data=%s", client_id, data)
         if not ws:
-            logger.error(f"[WebSocketTestHelper] send_json: No active connection for client {client_id}")
+            logger.error("[WebSocketTestHelper] send_json: No active connection for client %s", client_id)
             raise ValueError(f"No active connection for client {client_id}")
 
-        logger.debug(f"[WebSocketTestHelper] send_json: connection state before send: {ws.client_state}")
+        logger.debug("[WebSocketTestHelper] send_json: connection state before send: %s", ws.client_state)
+        # Pick the error policy once rather than re-checking it along the way
+        if ignore_errors:
+            return await self._send_json_swallow(ws, data, client_id, timeout)
+        return await self._send_json_raise(ws, data, client_id, timeout)
+
+    async def _send_json_raise(
+        self,
+        ws,
+        data: Dict[str, Any],
+        client_id: str,
+        timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        """send_json body for callers that want errors to propagate."""
+        # Sends complete without blocking, so only the receive needs a timer
+        await self._send_to(ws, data)
         try:
-            logger.debug(f"[WebSocketTestHelper] send_json: Before send_message client_id={client_id}")
             async with asyncio.timeout(timeout or self.message_timeout):
-                await self.websocket_manager.send_message(client_id, data)
-                logger.debug(f"[WebSocketTestHelper] send_json: After send_message, before receive_json client_id={client_id} connection state: {ws.client_state}")
                 response = await ws.receive_json()
-                logger.debug(f"[WebSocketTestHelper] send_json: After receive_json client_id={client_id} response={response} connection state: {ws.client_state}")
-
-                if not ignore_errors and response.get("type") == "error":
-                    logger.error(f"[WebSocketTestHelper] send_json: Received error response for client_id={client_id}: {response}")
-                    raise ConnectionClosed(
-                        Close(code=status.WS_1008_POLICY_VIOLATION, reason=response.get("content", "Unknown error")),
-                        None
-                    )
+        except asyncio.TimeoutError:
+            logger.error("[WebSocketTestHelper] send_json: Message timeout for client %s", client_id)
+            raise
+        logger.debug("[WebSocketTestHelper] send_json: After receive_json client_id=%s response=%s connection state: %s", client_id, response, ws.client_state)
 
-                return response
+        if response.get("type") == "error":
+            logger.error("[WebSocketTestHelper] send_json: Received error response for client_id=%s: %s", client_id, response)
+            raise _policy_close(response.get("content", "Unknown error"))
+        return response
 
+    async def _send_json_swallow(
+        self,
+        ws,
+        data: Dict[str, Any],
+        client_id: str,
+        timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        """send_json body for ignore_errors=True: error responses are returned, exceptions become error dicts."""
+        try:
+            # Sends complete without blocking, so only the receive needs a timer
+            await self._send_to(ws, data)
+            async with asyncio.timeout(timeout or self.message_timeout):
+                response = await ws.receive_json()
+            logger.debug("[WebSocketTestHelper] send_json: After receive_json client_id=%s response=%s connection state: %s", client_id, response, ws.client_state)
+            return response
         except asyncio.TimeoutError:
-            logger.error(f"[WebSocketTestHelper] send_json: Message timeout for client {client_id}")
+            logger.error("[WebSocketTestHelper] send_json: Message timeout for client %s", client_id)
             raise
         except Exception as e:
-            logger.error(f"[WebSocketTestHelper] send_json: Exception for client {client_id}: {e}")
-            if not ignore_errors:
-                raise
-            logger.warning(f"Error ignored for client {client_id}: {e}")
+            logger.warning("Error ignored for client %s: %s", client_id, e)
             return {"type": "error", "content": str(e)}
 
     async def wait_for_stream(
         self,
-        initial_message: Dict[str, Any],
+        initial_message: Union[Dict[str, Any], List[Dict[str, Any]]],
         client_id: str,
         ignore_errors: bool = False,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        max_stream_len: Optional[int] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Wait for a complete stream of messages.
 
         Args:
-            initial_message: Message to start the stream
+            initial_message: Message to start the stream, or a list of priming
+                messages ending with the one that starts it
             client_id: Client ID
             ignore_errors: Whether to ignore errors
             timeout: Optional timeout override
+            max_stream_len: Keep only the last N stream messages (default: all)
 
         Returns:
             Tuple of (stream messages, final message)
         """
-        print(f"[wait_for_stream] Called with initial_message: {initial_message}, client_id: {client_id}")
-        websocket = self.active_connections.get(client_id)
-        if not websocket:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[wait_for_stream] Called with initial_message: %s, client_id: %s", initial_message, client_id)
+        if not self.active_connections.get(client_id):
             raise ValueError(f"No active connection for client {client_id}")
 
-        stream_messages = []
+        stream_messages = deque(maxlen=max_stream_len)
+        append = stream_messages.append
         try:
             async with asyncio.timeout(timeout or self.message_timeout):
-                # Send initial message
-                await self.websocket_manager.send_message(client_id, initial_message)
-
-                while True:
-                    response = await websocket.mock_send()
-                    print(f"[wait_for_stream] Received message: {response} (id={id(response)})")
-                    await asyncio.sleep(0)  # Yield to event loop
-
-                    # If error message with non-empty content, return it immediately
-                    if response.get("type") == "error":
-                        print(f"[wait_for_stream] About to check error content: {response.get('content')} (id={id(response)})")
-                        if response.get("content"):
-                            print(f"[wait_for_stream] Returning due to error: {response} (id={id(response)})")
-                            return stream_messages, copy.deepcopy(response)
-                        else:
-                            print(f"[wait_for_stream] Skipping error with empty content: {response} (id={id(response)})")
+                async with aclosing(self.stream(initial_message, client_id)) as messages:
+                    async for response in messages:
+                        if response.get("type") == "stream":
+                            append(response)
                             continue
-
-                    if response.get("type") == "stream":
-                        stream_messages.append(response)
-                    elif response.get("type") == "stream_end":
-                        print(f"[wait_for_stream] Returning stream_messages: {stream_messages}, final_message: {response} (id={id(response)})")
-                        return stream_messages, copy.deepcopy(response)
+                        if debug:
+                            logger.debug("[wait_for_stream] Returning %d stream messages, final_message: %s", len(stream_messages), response)
+                        return list(stream_messages), response
         except Exception as e:
             if not ignore_errors:
                 raise
-            print(f"[wait_for_stream] Exception ignored: {e}")
-            return stream_messages, {"type": "error", "content": str(e)}
+            logger.debug("[wait_for_stream] Exception ignored: %s", e)
+            return list(stream_messages), {"type": "error", "content": str(e)}
+
+    async def stream(
+        self,
+        initial_message: Union[Dict[str, Any], List[Dict[str, Any]]],
+        client_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Start a stream and yield its messages as they arrive.
+
+        Yields each ``stream`` chunk, then the terminating ``stream_end`` or
+        error message, and stops. Errors with empty content are skipped. There
+        is no built-in timeout; wrap the iteration in ``asyncio.timeout``.
+
+        Args:
+            initial_message: Message to start the stream, or a list of priming
+                messages ending with the one that starts it
+            client_id: Client ID
+
+        Yields:
+            Stream chunks, followed by the final message
+        """
+        websocket = self.active_connections.get(client_id)
+        if not websocket:
+            raise ValueError(f"No active connection for client {client_id}")
+
+        if websocket.client_state != WebSocketState.CONNECTED:
+            raise ValueError(f"Client {client_id} not connected")
+
+        # Send initial message(s)
+        if isinstance(initial_message, list):
+            await self._send_many_to(websocket, initial_message)
+        else:
+            await self._send_to(websocket, initial_message)
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        mock_send = websocket.mock_send
+        while True:
+            response = await mock_send()
+            if debug:
+                logger.debug("[stream] Received message: %s", response)
+            msg_type = response.get("type")
+
+            if msg_type == "stream":
+                yield response
+            elif msg_type == "stream_end":
+                yield response
+                return
+            elif msg_type == "error":
+                # Only an error with content ends the stream
+                if response.get("content"):
+                    yield response
+                    return
+                if debug:
+                    logger.debug("[stream] Skipping error with empty content: %s", response)
 
     def get_connection_state(self, client_id: str) -> WebSocketState:
         """Get the connection state for a client.
@@ -281,16 +406,29 @@ class WebSocketTestHelper:
             Current WebSocket state
         """
         websocket = self.active_connections.get(client_id)
-        logger.debug(f"[WebSocketTestHelper] get_connection_state: client_id={client_id} id={id(websocket) if websocket else None} state={websocket.client_state if websocket else None}")
+        state = WebSocketState.DISCONNECTED if websocket is None else websocket.client_state
+        logger.debug("[WebSocketTestHelper] get_connection_state: client_id=%s id=%s state=%s", client_id, id(websocket) if websocket is not None else None, state)
         self.debug_active_connections()
-        return websocket.client_state if websocket else WebSocketState.DISCONNECTED
+        return state
 
     async def cleanup(self) -> None:
         """Clean up all test connections."""
-        for client_id in list(self.active_connections.keys()):
-            await self.disconnect(client_id)
-        self.active_connections.clear()
-        self.stream_messages.clear()
+        client_ids = list(self.active_connections)
+        results = await asyncio.gather(
+            *(self.disconnect(client_id) for client_id in client_ids),
+            return_exceptions=True
+        )
+        # One failed disconnect must not stop the others from being cleaned up
+        for client_id, result in zip(client_ids, results):
+            if isinstance(result, Exception):
+                logger.warning("[WebSocketTestHelper] cleanup: disconnect failed for client_id=%s: %s", client_id, result)
+        # disconnect() untracks each client itself; this only drops leftovers
+        # from clients removed via remove_connection()
+        self.reset()
+        if self.mock_pool is not None:
+            # Every client is disconnected, so the mocks can serve the next test
+            self.mock_pool.extend(self._checked_out)
+            self._checked_out.clear()
 
     def get_active_connections(self) -> List[str]:
         """Get list of active connection IDs.
@@ -324,15 +462,31 @@ class WebSocketTestHelper:
         Returns:
             True if state reached, False if timeout
         """
-        timeout = timeout or self.connect_timeout
-        start_time = datetime.now(UTC)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.connect_timeout)
 
-        while (datetime.now(UTC) - start_time).total_seconds() < timeout:
+        while True:
             if self.get_connection_state(client_id) == expected_state:
                 return True
-            await asyncio.sleep(0.1)
-
-        return False
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            websocket = self.active_connections.get(client_id)
+            try:
+                if isinstance(websocket, MockWebSocket):
+                    # Mock sockets signal transitions, so sleep until one happens
+                    async with asyncio.timeout(remaining):
+                        await websocket._state_changed.wait()
+                else:
+                    # Woken early by helper-driven changes; still polls for remote ones
+                    state_event = self._state_events.get(client_id)
+                    if state_event is None:
+                        await asyncio.sleep(min(0.1, remaining))
+                    else:
+                        async with asyncio.timeout(min(0.1, remaining)):
+                            await state_event.wait()
+            except asyncio.TimeoutError:
+                pass
 
     async def wait_for_disconnect(
         self,
@@ -365,11 +519,56 @@ class WebSocketTestHelper:
             client_id: Client ID
             message: Message to send
         """
-        if client_id not in self.active_connections:
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            raise ValueError(f"Client {client_id} not connected")
+        await self._send_to(websocket, message)
+
+    @staticmethod
+    async def _send_to(websocket, message: Dict[str, Any]) -> None:
+        """Send a message as the client of an already looked-up socket."""
+        # Mock sockets are push-only on send_json; simulate the client side instead
+        if isinstance(websocket, MockWebSocket):
+            await websocket.inject_client_message(message)
+        else:
+            await websocket.send_json(message)
+
+    @staticmethod
+    async def _send_many_to(websocket, messages: List[Dict[str, Any]]) -> None:
+        """Send several messages, in order, as the client of an already looked-up socket."""
+        if isinstance(websocket, MockWebSocket):
+            for message in messages:
+                await websocket.inject_client_message(message)
+        else:
+            await websocket.send_many(messages)
+
+    async def send_batch(
+        self,
+        client_id: str,
+        messages: List[Dict[str, Any]],
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Send several messages back-to-back and collect one response per message.
+
+        Args:
+            client_id: Client ID
+            messages: Messages to send, in order
+            timeout: Optional timeout override for the whole batch
+
+        Returns:
+            Responses, in the order they were received
+        """
+        websocket = self.active_connections.get(client_id)
+        if not websocket:
+            raise ValueError(f"No active connection for client {client_id}")
+
+        if websocket.client_state != WebSocketState.CONNECTED:
             raise ValueError(f"Client {client_id} not connected")
 
-        websocket = self.active_connections[client_id]
-        await websocket.send_json(message)
+        async with asyncio.timeout(timeout or self.message_timeout):
+            await self._send_many_to(websocket, messages)
+            receive = websocket.receive_json
+            return [await receive() for _ in messages]
 
     async def receive_message(
         self,
@@ -377,19 +576,19 @@ class WebSocketTestHelper:
         timeout: float = 5.0
     ) -> Dict[str, Any]:
         """Receive a message from a test WebSocket client, skipping 'ping' messages."""
-        if client_id not in self.active_connections:
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
             raise ValueError(f"Client {client_id} not connected")
 
-        websocket = self.active_connections[client_id]
         try:
             async with asyncio.timeout(timeout):
                 while True:
                     msg = await websocket.receive_json()
-                    if msg.get("type") == "ping":
-                        continue  # Skip echoed ping
-                    return msg
+                    # Skip echoed pings
+                    if msg.get("type") != "ping":
+                        return msg
         except asyncio.TimeoutError:
-            logger.error(f"Timeout waiting for message from {client_id}")
+            logger.error("Timeout waiting for message from %s", client_id)
             raise
 
     async def send_and_receive(
@@ -408,8 +607,23 @@ class WebSocketTestHelper:
         Returns:
             Response message
         """
-        await self.send_message(client_id, message)
-        return await self.receive_message(client_id, timeout)
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            raise ValueError(f"Client {client_id} not connected")
+
+        # One budget covers both the send and the receive
+        try:
+            async with asyncio.timeout(timeout):
+                # Reuse the socket looked up above rather than going through send_message
+                await self._send_to(websocket, message)
+                while True:
+                    msg = await websocket.receive_json()
+                    # Skip echoed pings
+                    if msg.get("type") != "ping":
+                        return msg
+        except asyncio.TimeoutError:
+            logger.error("Timeout waiting for message from %s", client_id)
+            raise
 
     async def wait_for_message(
         self,
@@ -419,6 +633,9 @@ class WebSocketTestHelper:
     ) -> Dict[str, Any]:
         """Wait for a specific message type.
 
+        Messages of other types received while waiting are kept per type and
+        handed out by later calls instead of being dropped.
+
         Args:
             client_id: Client ID
             message_type: Expected message type
@@ -431,20 +648,24 @@ class WebSocketTestHelper:
         if not websocket:
             raise ValueError(f"No active connection for client {client_id}")
 
+        pending = self._typed_queues[client_id]
+        buffered = pending.get(message_type)
+        if buffered:
+            return buffered.popleft()
+
         try:
             async with asyncio.timeout(timeout or self.message_timeout):
                 while True:
                     response = await websocket.receive_json()
-                    if response.get("type") == message_type:
+                    msg_type = response.get("type")
+                    if msg_type == message_type:
                         return response
-                    elif response.get("type") == "error":
-                        raise ConnectionClosed(
-                            Close(code=status.WS_1008_POLICY_VIOLATION, reason=response.get("content", "Unknown error")),
-                            None
-                        )
+                    elif msg_type == "error":
+                        raise _policy_close(response.get("content", "Unknown error"))
+                    pending[msg_type].append(response)
 
         except asyncio.TimeoutError:
-            logger.error(f"Timeout waiting for message type {message_type}")
+            logger.error("Timeout waiting for message type %s", message_type)
             raise
 
     @property
@@ -454,15 +675,19 @@ class WebSocketTestHelper:
 
     def debug_active_connections(self):
         """Log all active connection ids and their states/ids for debugging."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         for cid, ws in self.active_connections.items():
-            logger.debug(f"[WebSocketTestHelper] active: client_id={cid} state={ws.client_state} id={id(ws)}")
+            logger.debug("[WebSocketTestHelper] active: client_id=%s state=%s id=%s", cid, ws.client_state, id(ws))
 
     def add_connection(self, client_id: str, ws: MockWebSocket):
-        logger.debug(f"[WebSocketTestHelper] ADD active_connections: client_id={client_id} id={id(ws)} state={ws.client_state}")
+        logger.debug("[WebSocketTestHelper] ADD active_connections: client_id=%s id=%s state=%s", client_id, id(ws), ws.client_state)
         self.active_connections[client_id] = ws
+        self._state_events[client_id] = asyncio.Event()
 
     def remove_connection(self, client_id: str):
-        ws = self.active_connections.get(client_id)
-        logger.debug(f"[WebSocketTestHelper] REMOVE active_connections: client_id={client_id} id={id(ws) if ws else None} state={ws.client_state if ws else None}")
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
\ No newline at end of file
+        ws = self.active_connections.pop(client_id, None)
+        logger.debug("[WebSocketTestHelper] REMOVE active_connections: client_id=%s id=%s state=%s", client_id, id(ws) if ws else None, ws.client_state if ws else None)
+        state_event = self._state_events.pop(client_id, None)
+        if state_event is not None:
+            state_event.set()
\ No newline at end of file
@@ -1,60 +1,72 @@
 import os
 import re
+import sys
+from itertools import islice
 
 RULES_DIR = ".cursor/rules/"
 RULES_INDEX = "docs/rules_index.md"
+INDEX_ENTRY_RE = re.compile(r"^\| \[([^\]]+)\]", re.MULTILINE)
+MIN_RULE_LINES = 5
+# Smallest file that can hold MIN_RULE_LINES non-blank lines ("x\n" * 4 + "x")
+MIN_RULE_BYTES = 2 * MIN_RULE_LINES - 1
 
-print("==============================")
-print(" AI-IDE Rule Linter")
-print("==============================\n")
+# Report lines, written to stdout in one go at the end
+out = []
+
+out.append("==============================")
+out.append(" AI-IDE Rule Linter")
+out.append("==============================\n")
 
 # 1. Gather all .mdc files in rules dir
-actual_files = set(f for f in os.listdir(RULES_DIR) if f.endswith('.mdc'))
+rule_entries = {e.name: e for e in os.scandir(RULES_DIR) if e.is_file() and e.name.endswith('.mdc')}
+actual_files = set(rule_entries)
 
 # 2. Parse rules_index.md for listed files
-listed_files = set()
 with open(RULES_INDEX) as f:
-    for line in f:
-        m = re.match(r"\| \[([^\]]+)\]", line)
-        if m:
-            listed_files.add(m.group(1))
+    listed_files = set(INDEX_ENTRY_RE.findall(f.read()))
 
 # 3. Check for missing or extra files
 missing_in_index = actual_files - listed_files
 missing_on_disk = listed_files - actual_files
 
 if missing_in_index:
-    print("❌ The following rule files are present in .cursor/rules/ but missing from rules_index.md:")
+    out.append("❌ The following rule files are present in .cursor/rules/ but missing from rules_index.md:")
     for f in sorted(missing_in_index):
-        print(f"  - {f}")
+        out.append(f"  - {f}")
 if missing_on_disk:
-    print("❌ The following rule files are listed in rules_index.md but missing from .cursor/rules/:")
+    out.append("❌ The following rule files are listed in rules_index.md but missing from .cursor/rules/:")
     for f in sorted(missing_on_disk):
-        print(f"  - {f}")
+        out.append(f"  - {f}")
 if not missing_in_index and not missing_on_disk:
-    print("✅ All rule files are present and indexed.")
+    out.append("✅ All rule files are present and indexed.")
 
 # 4. Check for empty or very short rule files
 short_files = []
-for f in actual_files:
-    path = os.path.join(RULES_DIR, f)
+for f, entry in rule_entries.items():
     try:
-        with open(path) as rulef:
-            lines = [line for line in rulef if line.strip() and not line.strip().startswith('#')]
-            if len(lines) < 5:
+        if entry.stat().st_size < MIN_RULE_BYTES:
+            short_files.append(f)
+            continue
+        with open(entry.path, 'rb') as rulef:
+            stripped = (line.strip() for line in rulef.read().splitlines())
+            content = (line for line in stripped if line and not line.startswith(b'#'))
+            # Stop counting once the file is known to be long enough
+            if len(list(islice(content, MIN_RULE_LINES))) < MIN_RULE_LINES:
                 short_files.append(f)
     except Exception as e:
-        print(f"Error reading {f}: {e}")
+        out.append(f"Error reading {f}: {e}")
 
 if short_files:
-    print("⚠️  The following rule files are empty or very short (less than 5 non-comment lines):")
+    out.append(f"⚠️  The following rule files are empty or very short (less than {MIN_RULE_LINES} non-comment lines):")
     for f in short_files:
-        print(f"  - {f}")
+        out.append(f"  - {f}")
 else:
-    print("✅ All rule files have content.")
+    out.append("✅ All rule files have content.")
+
+out.append("\nSuggestions:")
+out.append("- Update docs/rules_index.md to match .cursor/rules/.")
+out.append("- Add content to any empty or very short rule files.")
+out.append("- Remove obsolete rule files if no longer needed.")
+out.append("- Run this script regularly to keep your rules healthy!")
 
-print("\nSuggestions:")
-print("- Update docs/rules_index.md to match .cursor/rules/.")
-print("- Add content to any empty or very short rule files.")
-print("- Remove obsolete rule files if no longer needed.")
-print("- Run this script regularly to keep your rules healthy!") 
\ No newline at end of file
+sys.stdout.write("\n".join(out) + "\n")
@@ -1,5 +1,9 @@
+import mmap
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
 RULES_DIR = Path('.cursor/rules')
@@ -14,13 +18,31 @@ REQUIRED_SECTIONS = [
 SECTION_TEMPLATE = """{section}
 ----------------
 (Add content for this section.)\n\n"""
+# Rendered once, as the bytes add_missing_sections splices into the files
+RENDERED_SECTIONS = {s: SECTION_TEMPLATE.format(section=s).encode('utf-8') for s in REQUIRED_SECTIONS}
+# One bit per required section, keyed by header title as it appears in the file
+SECTION_BITS = {s.encode('utf-8'): 1 << i for i, s in enumerate(REQUIRED_SECTIONS)}
+ALL_SECTIONS = (1 << len(REQUIRED_SECTIONS)) - 1
+
+# Scanning is mostly waiting on page faults and reads, which release the GIL
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
 MERMAID_HEADER = '```mermaid\ngraph TD\n'
 MERMAID_FOOTER = '```\n'
 
-RULE_LINK_RE = re.compile(r'\[([^\]]+)\]\(mdc:([^\)]+)\)')
-SECTION_HEADER_RE = re.compile(r'^(#+)\s*(.+)$', re.MULTILINE)
-YAML_FRONTMATTER_RE = re.compile(r'^---[\s\S]+?---', re.MULTILINE)
+# One bytes scanner for headers and rule links, so each mmapped rule file is
+# walked once without decoding it; the frontmatter is found by frontmatter_end.
+# The header alternative is a lookahead: it consumes nothing, so links inside a
+# header line are still found. Header padding is [ \t] rather than \s, so a
+# bare "#" line cannot swallow the next line; re.ASCII spells out the 8-bit
+# classes bytes patterns already use.
+RULE_SCANNER_RE = re.compile(
+    rb'^(?=#+[ \t]*(?P<header>.+)$)'
+    rb'|\[[^\]]+\]\(mdc:(?P<link>[^\)]+)\)',
+    re.MULTILINE | re.ASCII,
+)
+# Searched only up to frontmatter_end; [ \t] keeps an empty value from taking the next line
+DESCRIPTION_RE = re.compile(rb'^description:[ \t]*(.+)$', re.MULTILINE | re.ASCII)
 
 
 def ensure_docs_dir():
@@ -31,97 +53,164 @@ def ensure_docs_dir():
 def get_rule_files():
     return sorted(RULES_DIR.glob('*.mdc'))
 
-def parse_sections(content):
-    headers = {m.group(2).strip(): m.start() for m in SECTION_HEADER_RE.finditer(content)}
-    return headers
-
-def add_missing_sections(content):
-    # Find where to insert missing sections (after YAML frontmatter if present)
-    yaml_match = YAML_FRONTMATTER_RE.match(content)
-    insert_pos = yaml_match.end() if yaml_match else 0
-    present_sections = set(parse_sections(content).keys())
-    missing = [s for s in REQUIRED_SECTIONS if s not in present_sections]
-    if not missing:
+@contextmanager
+def _open_mmap(path):
+    """Map a rule file read-only; yields b'' for empty files, which mmap rejects."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+    finally:
+        os.close(fd)
+
+def add_missing_sections(content, insert_pos, present_mask):
+    """Insert the required sections whose SECTION_BITS are unset in present_mask at insert_pos."""
+    if present_mask == ALL_SECTIONS:
         return content, False
-    to_insert = '\n'.join(SECTION_TEMPLATE.replace('{{section}}', s) for s in missing)
-    new_content = content[:insert_pos] + '\n' + to_insert + content[insert_pos:]
+    missing = [s for i, s in enumerate(REQUIRED_SECTIONS) if not present_mask & (1 << i)]
+    to_insert = b'\n'.join(RENDERED_SECTIONS[s] for s in missing)
+    new_content = content[:insert_pos] + b'\n' + to_insert + content[insert_pos:]
     return new_content, True
 
-def check_links(content, rule_file):
+@dataclass(slots=True)
+class RuleFacts:
+    """Everything the later passes need from one rule file, gathered in a single read."""
+    path: Path
+    links: list
+    description: str
+    first_heading: str
+    # Rewritten content with the missing sections added, or None if none were missing
+    new_content: bytes | None = None
+
+def frontmatter_end(content):
+    """Return the offset just past the YAML frontmatter, or 0 if there is none.
+
+    The frontmatter runs from a leading '---' to the next '---' after it. Two
+    plain byte searches find it, so files without frontmatter never reach re.
+    """
+    if content[:3] != b'---':
+        return 0
+    close = content.find(b'---', 4)
+    return 0 if close == -1 else close + 3
+
+def scan_rule_file(rule_file):
+    with _open_mmap(rule_file) as content:
+        desc = ''
+        # Missing sections go after the YAML frontmatter if present
+        insert_pos = frontmatter_end(content)
+        if insert_pos:
+            desc_match = DESCRIPTION_RE.search(content, 0, insert_pos)
+            if desc_match:
+                desc = desc_match.group(1).strip().decode('utf-8')
+        first_heading = None
+        present_mask = 0
+        links = []
+        for m in RULE_SCANNER_RE.finditer(content):
+            kind = m.lastgroup
+            if kind == 'link':
+                links.append(m.group('link').decode('utf-8'))
+            else:
+                # Only the first title is kept; the rest just tick off required sections
+                title = m.group('header').strip()
+                if first_heading is None:
+                    first_heading = title.decode('utf-8')
+                present_mask |= SECTION_BITS.get(title, 0)
+        new_content, changed = add_missing_sections(content, insert_pos, present_mask)
+        if first_heading is None:
+            first_heading = rule_file.stem
+    return RuleFacts(rule_file, links, desc, first_heading, new_content if changed else None)
+
+def check_links(facts, known_targets):
+    """Report links whose target is missing.
+
+    known_targets maps normalized target paths to whether they exist. It starts
+    out holding the rule files, and other targets are stat'ed once and added, so
+    a link repeated across files costs a dict lookup rather than a syscall.
+    """
     broken = []
-    for _, path in RULE_LINK_RE.findall(content):
-        target = (RULES_DIR / Path(path)).resolve()
-        if not target.exists():
+    for path in facts.links:
+        target = os.path.normpath(os.path.join(RULES_DIR, path))
+        exists = known_targets.get(target)
+        if exists is None:
+            exists = known_targets[target] = os.path.exists(target)
+        if not exists:
             broken.append(path)
     if broken:
-        print(f"{rule_file.name}: Broken links: {broken}")
+        print(f"{facts.path.name}: Broken links: {broken}")
     return broken
 
-def extract_rule_relationships(rule_files):
-    edges = set()
-    for rule_file in rule_files:
-        content = rule_file.read_text(encoding='utf-8')
-        for _, path in RULE_LINK_RE.findall(content):
-            target = Path(path).with_suffix('').name
-            source = rule_file.stem
-            edges.add((source, target))
+def extract_rule_relationships(all_facts):
+    """Return the (source, target) edges, deduplicated and already in sorted order.
+
+    Sorting the files by stem and each file's few targets gives the same order as
+    sorting every edge tuple, without one big sort over all of them.
+    """
+    edges = []
+    for facts in sorted(all_facts, key=lambda facts: facts.path.stem):
+        source = facts.path.stem
+        targets = {Path(path).with_suffix('').name for path in facts.links}
+        edges.extend((source, target) for target in sorted(targets))
     return edges
 
 def generate_mermaid(edges):
-    lines = [MERMAID_HEADER]
-    for src, tgt in sorted(edges):
-        lines.append(f'  {src} --> {tgt}')
-    lines.append(MERMAID_FOOTER)
-    return '\n'.join(lines)
-
-def extract_rule_index(rule_files):
-    index = []
-    for rule_file in rule_files:
-        content = rule_file.read_text(encoding='utf-8')
-        # Try to extract YAML frontmatter description
-        desc = ''
-        yaml_match = YAML_FRONTMATTER_RE.match(content)
-        if yaml_match:
-            desc_match = re.search(r'description:\s*(.+)', yaml_match.group(0))
-            if desc_match:
-                desc = desc_match.group(1).strip()
-        # Get first heading
-        headings = list(SECTION_HEADER_RE.finditer(content))
-        first_heading = headings[0].group(2).strip() if headings else rule_file.stem
-        index.append((rule_file.name, first_heading, desc))
-    return index
+    # Built straight into UTF-8 bytes for write_output; edges arrive sorted
+    buf = bytearray(MERMAID_HEADER.encode('utf-8'))
+    for src, tgt in edges:
+        buf += f'\n  {src} --> {tgt}'.encode('utf-8')
+    buf += b'\n' + MERMAID_FOOTER.encode('utf-8')
+    return buf
+
+def extract_rule_index(all_facts):
+    return [(facts.path.name, facts.first_heading, facts.description) for facts in all_facts]
 
 def generate_index_md(index):
-    lines = ['# Rules Index\n']
-    lines.append('| File | Title | Description |')
-    lines.append('|------|-------|-------------|')
+    buf = bytearray(b'# Rules Index\n\n| File | Title | Description |\n|------|-------|-------------|')
     for fname, title, desc in index:
-        lines.append(f'| [{fname}](../.cursor/rules/{fname}) | {title} | {desc} |')
-    return '\n'.join(lines)
+        buf += f'\n| [{fname}](../.cursor/rules/{fname}) | {title} | {desc} |'.encode('utf-8')
+    return buf
+
+def write_output(path, data):
+    """Write a generated document with raw os.write calls, bypassing the io stack."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 def main():
     ensure_docs_dir()
     rule_files = get_rule_files()
+    # Each file is read once, in parallel; the sections added below carry no
+    # links or headings, so the facts stay valid after the auto-fix
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        all_facts = list(executor.map(scan_rule_file, rule_files))
     all_broken = []
-    for rule_file in rule_files:
-        content = rule_file.read_text(encoding='utf-8')
-        # Auto-fix missing sections
-        new_content, changed = add_missing_sections(content)
-        if changed:
-            rule_file.write_text(new_content, encoding='utf-8')
-            print(f"Added missing sections to {rule_file.name}")
+    known_targets = dict.fromkeys(map(os.path.normpath, rule_files), True)
+    # Reporting and writes stay on this thread, in file order
+    for facts in all_facts:
+        rule_file = facts.path
         # Check links
-        broken = check_links(content, rule_file)
+        broken = check_links(facts, known_targets)
+        # Auto-fix missing sections; scan_rule_file has closed the map by now, as
+        # truncating a still-mapped file would fault on the stale pages
+        if facts.new_content is not None:
+            rule_file.write_bytes(facts.new_content)
+            print(f"Added missing sections to {rule_file.name}")
         all_broken.extend((rule_file.name, b) for b in broken)
     # Mermaid diagram
-    edges = extract_rule_relationships(rule_files)
+    edges = extract_rule_relationships(all_facts)
     mermaid = generate_mermaid(edges)
-    (DOCS_DIR / 'rules_relationships.md').write_text(mermaid, encoding='utf-8')
+    write_output(DOCS_DIR / 'rules_relationships.md', mermaid)
     print("Generated docs/rules_relationships.md (Mermaid diagram)")
     # Rules index
-    index = extract_rule_index(rule_files)
+    index = extract_rule_index(all_facts)
     index_md = generate_index_md(index)
-    (DOCS_DIR / 'rules_index.md').write_text(index_md, encoding='utf-8')
+    write_output(DOCS_DIR / 'rules_index.md', index_md)
     print("Generated docs/rules_index.md (rules summary)")
     # Summary
     if all_broken:
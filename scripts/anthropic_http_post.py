@@ -11,7 +11,6 @@ This script will incur real API usage and should only be run intentionally.
 import os
 import sys
 import requests
-import json
 
 ANTHROPIC_API_URL = os.getenv("ANTHROPIC_API_URL", "https://api.anthropic.com/v1/messages")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
@@ -23,7 +22,6 @@ if not ANTHROPIC_API_KEY:
 headers = {
     "x-api-key": ANTHROPIC_API_KEY,
     "anthropic-version": "2023-06-01",
-    "content-type": "application/json",
 }
 
 payload = {
@@ -35,10 +33,18 @@ payload = {
 }
 
 try:
-    response = requests.post(ANTHROPIC_API_URL, headers=headers, data=json.dumps(payload))
-    print("Status code:", response.status_code)
-    print("Response:", response.text)
-    response.raise_for_status()
+    # A session keeps the TLS connection alive for any further requests
+    with requests.Session() as session:
+        session.headers.update(headers)
+        # Stream the body to stdout as it arrives instead of buffering it all
+        with session.post(ANTHROPIC_API_URL, json=payload, stream=True, timeout=30) as response:
+            print("Status code:", response.status_code)
+            print("Response: ", end="", flush=True)
+            for chunk in response.iter_content(chunk_size=8192):
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
+            response.raise_for_status()
     print("Anthropic HTTP POST API test PASSED")
 except Exception as e:
     print(f"Anthropic HTTP POST API test FAILED: {e}")
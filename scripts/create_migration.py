@@ -1,12 +1,12 @@
+import logging
 import os
 import sys
-from pathlib import Path
 
 def create_migration(name):
-    # Add parent directory to Python path
-    parent_dir = Path("/app").absolute()
-    sys.path.append(str(parent_dir))
-    print("DEBUG: Python path:", sys.path)
+    # `make migrate-create` runs this inside the backend container, where app is importable:
+    # backend/Dockerfile sets ENV PYTHONPATH=/app:/app/backend (the image docker-compose.test.yml
+    # builds), and docker-compose.dev.yml / docker-compose.staging.yml set PYTHONPATH=/app.
+    # Elsewhere, run it with PYTHONPATH pointing at the backend directory.
 
     # Import required models
     from app.db.session import Base
@@ -20,52 +20,23 @@ def create_migration(name):
         f"@{os.getenv('POSTGRES_HOST')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}"
     )
 
-    # Create alembic.ini
-    alembic_config = f"""[alembic]
-script_location = alembic
-sqlalchemy.url = {db_url}
-
-[loggers]
-keys = root,sqlalchemy,alembic
-
-[handlers]
-keys = console
-
-[formatters]
-keys = generic
-
-[logger_root]
-level = WARN
-handlers = console
-qualname =
-
-[logger_sqlalchemy]
-level = WARN
-handlers =
-qualname = sqlalchemy.engine
-
-[logger_alembic]
-level = INFO
-handlers =
-qualname = alembic
-
-[handler_console]
-class = StreamHandler
-args = (sys.stderr,)
-level = NOTSET
-formatter = generic
-
-[formatter_generic]
-format = %(levelname)-5.5s [%(name)s] %(message)s
-datefmt = %H:%M:%S"""
-
-    with open("alembic.ini", "w") as f:
-        f.write(alembic_config)
-    print("DEBUG: Created alembic.ini with URL:", db_url)
+    # Configure alembic in memory rather than writing an alembic.ini for it to re-parse.
+    # Without an ini file env.py skips fileConfig, so set up the same logging here.
+    logging.basicConfig(
+        format="%(levelname)-5.5s [%(name)s] %(message)s",
+        datefmt="%H:%M:%S",
+        level=logging.WARN,
+    )
+    logging.getLogger("alembic").setLevel(logging.INFO)
+    from alembic import command
+    from alembic.config import Config
+    cfg = Config()
+    cfg.set_main_option("script_location", "alembic")
+    cfg.set_main_option("sqlalchemy.url", db_url)
+    print("DEBUG: Configured alembic with URL:", db_url)
 
     # Run alembic migration
-    import alembic.config
-    alembic.config.main(["revision", "--autogenerate", "-m", name])
+    command.revision(cfg, message=name, autogenerate=True)
 
 if __name__ == "__main__":
     if len(sys.argv) != 2: